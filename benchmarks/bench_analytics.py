@@ -0,0 +1,56 @@
+"""Time of summarizing the durations of all testcases of a report per testsuite.
+
+Compares reading ``TestCase.time`` object by object with
+:func:`junitparser.analytics.summarize`, with NumPy if it is installed and
+without. Run with::
+
+    python benchmarks/bench_analytics.py --testcases 1000000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from junitparser import JUnitXml, analytics
+from synthetic import write_report
+
+
+def by_objects(xml):
+    summaries = {}
+    for suite in xml:
+        times = sorted(case.time for case in suite if case.time is not None)
+        summaries[suite.name] = (sum(times), statistics.quantiles(times, n=100))
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--testcases", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xml")
+        write_report(path, args.testcases)
+        xml = JUnitXml.fromfile(path)
+
+    start = time.perf_counter()
+    summaries = by_objects(xml)
+    elapsed = time.perf_counter() - start
+    print(f"objects: {elapsed:6.2f}s for {len(summaries)} testsuites")
+
+    start = time.perf_counter()
+    columns = xml.to_columns()
+    print(f"columns: {time.perf_counter() - start:6.2f}s")
+    numpy = analytics.numpy
+    for label in ("stdlib", "numpy") if numpy is not None else ("stdlib",):
+        analytics.numpy = numpy if label == "numpy" else None
+        start = time.perf_counter()
+        summaries = analytics.summarize(columns)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>7}: {elapsed:6.2f}s from the columns")
+
+
+if __name__ == "__main__":
+    main()
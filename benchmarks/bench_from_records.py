@@ -0,0 +1,61 @@
+"""Time of building a report from records, compared to building it object by object.
+
+Run with::
+
+    python benchmarks/bench_from_records.py --testcases 500000
+"""
+
+import argparse
+import time
+
+from junitparser import Failure, SystemOut, TestCase, TestSuite
+
+
+def records(count):
+    for index in range(count):
+        status = "failure" if index % 10 == 0 else None
+        yield (
+            f"test_{index}",
+            "pkg.TestClass",
+            0.001,
+            status,
+            "assert",
+            "trace",
+            "out",
+        )
+
+
+def by_objects(count):
+    cases = []
+    for name, classname, time_, status, message, text, stdout in records(count):
+        case = TestCase(name, classname, time_)
+        if status:
+            failure = Failure(message)
+            failure.text = text
+            case.append(failure)
+        case.append(SystemOut(stdout))
+        cases.append(case)
+    suite = TestSuite("suite")
+    suite.add_testcases(cases)
+    return suite
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--testcases", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for label, build in (
+        ("objects", by_objects),
+        ("records", lambda count: TestSuite.from_records(records(count))),
+    ):
+        start = time.perf_counter()
+        suite = build(args.testcases)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{label}: {elapsed:6.2f}s, tests={suite.tests} failures={suite.failures}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Peak memory of parsing a large report from bytes or from a memory map.
+
+Before buffers were accepted by ``JUnitXml.fromstring``, a memory-mapped report
+had to be copied into a ``bytes`` object first. Run with::
+
+    python benchmarks/bench_fromstring_mmap.py --size-mb 1024
+"""
+
+import argparse
+import mmap
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic import testcases_for_size, write_report
+
+
+def run(path, mode):
+    from junitparser import JUnitXml
+
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mode == "bytes":
+                xml = JUnitXml.fromstring(bytes(mm))
+            else:
+                xml = JUnitXml.fromstring(mm)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux, in bytes on macOS.
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        maxrss *= 1024
+    print(f"{mode:>6}: {elapsed:6.2f}s, peak RSS {maxrss / 2**20:8.1f} MiB")
+    del xml
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--output-size", type=int, default=4096)
+    parser.add_argument("--mode", choices=["bytes", "mmap"])
+    parser.add_argument("--file")
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.file, args.mode)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xml")
+        testcases = testcases_for_size(args.size_mb * 2**20, args.output_size)
+        write_report(path, testcases, args.output_size)
+        size = os.path.getsize(path)
+        print(f"report: {size / 2**20:.1f} MiB, {testcases} testcases")
+        # Each mode runs in a fresh process, so that peak RSS isn't shared.
+        for mode in ("bytes", "mmap"):
+            subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--file", path],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Time of building a testsuite case by case, and of reading its statistics.
+
+Adding or removing a testcase updates the statistics of the testsuite and of
+the report containing it by the change, instead of recounting every testcase.
+Run with::
+
+    python benchmarks/bench_incremental_statistics.py --testcases 20000
+"""
+
+import argparse
+import time
+
+from junitparser import Failure, JUnitXml, TestCase, TestSuite
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--testcases", type=int, default=5000)
+    args = parser.parse_args()
+
+    xml = JUnitXml()
+    suite = TestSuite("suite")
+    xml.add_testsuite(suite)
+    xml.update_statistics()
+
+    start = time.perf_counter()
+    cases = []
+    for index in range(args.testcases):
+        case = TestCase(f"test_{index}", time=0.001)
+        if index % 10 == 0:
+            case.result = [Failure("assert 1 == 2")]
+        suite.add_testcase(case)
+        cases.append(case)
+    print(f"   add: {time.perf_counter() - start:6.2f}s")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        xml.update_statistics()
+    print(f"update: {(time.perf_counter() - start) / 1000 * 1e6:6.1f}us per call")
+
+    start = time.perf_counter()
+    for case in cases[: args.testcases // 10]:
+        suite.remove_testcase(case)
+    print(f"remove: {time.perf_counter() - start:6.2f}s for a tenth")
+    print(f"tests={xml.tests} failures={xml.failures} time={xml.time}")
+
+
+if __name__ == "__main__":
+    main()
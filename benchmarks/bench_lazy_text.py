@@ -0,0 +1,65 @@
+"""Peak memory of loading a report with output, with and without lazy text.
+
+With ``lazy_text=True`` the captured output stays in the file and only its
+position is kept in the tree. Run with::
+
+    python benchmarks/bench_lazy_text.py --size-mb 512
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic import testcases_for_size, write_report
+
+
+def run(path, mode):
+    from junitparser import JUnitXml
+
+    start = time.perf_counter()
+    xml = JUnitXml.fromfile(path, lazy_text=mode == "lazy")
+    failures = sum(1 for suite in xml for case in suite if case.is_failure)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux, in bytes on macOS.
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        maxrss *= 1024
+    print(
+        f"{mode:>6}: {elapsed:6.2f}s, peak RSS {maxrss / 2**20:8.1f} MiB, "
+        f"{failures} failures"
+    )
+    del xml
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--output-size", type=int, default=4096)
+    parser.add_argument("--mode", choices=["eager", "lazy"])
+    parser.add_argument("--file")
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.file, args.mode)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xml")
+        testcases = testcases_for_size(args.size_mb * 2**20, args.output_size)
+        write_report(path, testcases, args.output_size)
+        size = os.path.getsize(path)
+        print(f"report: {size / 2**20:.1f} MiB, {testcases} testcases")
+        # Each mode runs in a fresh process, so that peak RSS isn't shared.
+        for mode in ("eager", "lazy"):
+            subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--file", path],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
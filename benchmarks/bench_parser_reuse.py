@@ -0,0 +1,52 @@
+"""Time of parsing many small reports with a new or a cached parser.
+
+Before ``get_parser``, a configured parser could only be passed through a
+``parse_func``, which typically creates a parser for each file. Run with::
+
+    python benchmarks/bench_parser_reuse.py --files 5000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from lxml.etree import XMLParser, parse
+
+from junitparser import JUnitXml, get_parser
+from synthetic import write_report
+
+
+def parse_func(file):
+    return parse(file, XMLParser(huge_tree=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--testcases", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index in range(args.files):
+            path = os.path.join(tmp, f"TEST-{index}.xml")
+            write_report(path, args.testcases)
+            paths.append(path)
+
+        modes = {
+            "parse_func": lambda path: JUnitXml.fromfile(path, parse_func),
+            "get_parser": lambda path: JUnitXml.fromfile(
+                path, parser=get_parser(huge_tree=True)
+            ),
+        }
+        for mode, fromfile in modes.items():
+            start = time.perf_counter()
+            for path in paths:
+                fromfile(path)
+            elapsed = time.perf_counter() - start
+            print(f"{mode:>10}: {elapsed:6.2f}s for {args.files} files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Time of removing the skipped testcases of a report.
+
+Run with::
+
+    python benchmarks/bench_remove_testcases.py --testcases 200000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from junitparser import JUnitXml
+from synthetic import write_report
+
+
+def one_by_one(xml):
+    removed = 0
+    for suite in xml:
+        for case in [case for case in suite if case.is_skipped]:
+            suite.remove_testcase(case)
+            removed += 1
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--testcases", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xml")
+        write_report(path, args.testcases, suite_size=args.testcases)
+        for label, remove in (
+            ("one by one", one_by_one),
+            (
+                "predicate",
+                lambda xml: xml.remove_testcases(lambda case: case.is_skipped),
+            ),
+        ):
+            xml = JUnitXml.fromfile(path)
+            start = time.perf_counter()
+            removed = remove(xml)
+            xml.update_statistics()
+            elapsed = time.perf_counter() - start
+            print(f"{label:>10}: {elapsed:6.2f}s to remove {removed}, {xml.tests} left")
+
+
+if __name__ == "__main__":
+    main()
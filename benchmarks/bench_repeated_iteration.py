@@ -0,0 +1,50 @@
+"""Time of iterating a report several times.
+
+The same element is wrapped by the same object as long as it is in use, so
+iterating a report again while its testcases are held allocates no wrappers.
+Run with::
+
+    python benchmarks/bench_repeated_iteration.py --testcases 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from junitparser import JUnitXml
+from synthetic import write_report
+
+
+def iterate(xml):
+    failures = 0
+    for suite in xml:
+        for case in suite:
+            if case.is_failure:
+                failures += 1
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--testcases", type=int, default=200_000)
+    parser.add_argument("--passes", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xml")
+        write_report(path, args.testcases)
+        xml = JUnitXml.fromfile(path)
+
+    for mode in ("fresh", "held"):
+        held = [case for suite in xml for case in suite] if mode == "held" else []
+        start = time.perf_counter()
+        for _ in range(args.passes):
+            iterate(xml)
+        elapsed = time.perf_counter() - start
+        print(f"{mode:>5}: {elapsed / args.passes:6.2f}s per pass")
+        del held
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Time of selecting testcases by status, classname and time in a report.
+
+Run with::
+
+    python benchmarks/bench_select.py --testcases 200000
+"""
+
+import argparse
+import fnmatch
+import os
+import tempfile
+import time
+
+from junitparser import JUnitXml
+from synthetic import write_report
+
+
+def loop(xml):
+    return [
+        case
+        for suite in xml
+        for case in suite
+        if case.status == "failure"
+        and fnmatch.fnmatchcase(case.classname, "pkg.module1*")
+        and case.time is not None
+        and case.time >= 0.5
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--testcases", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xml")
+        write_report(path, args.testcases)
+        xml = JUnitXml.fromfile(path)
+
+    expected = len(loop(xml))
+    for label, select in (
+        ("  loop", loop),
+        (
+            "select",
+            lambda xml: xml.select(
+                status="failure", classname_glob="pkg.module1*", min_time=0.5
+            ),
+        ),
+    ):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            assert len(select(xml)) == expected
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"{label}: {elapsed * 1e3:10.1f}ms for {expected} of {args.testcases}")
+
+
+if __name__ == "__main__":
+    main()
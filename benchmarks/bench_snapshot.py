@@ -0,0 +1,76 @@
+"""Memory of a report kept as a tree or as a snapshot, and pickling the snapshot.
+
+The memory is the growth of the resident set size of a fresh process reading
+the report, which includes the memory of lxml, so it is measured on Linux
+only. Run with::
+
+    python benchmarks/bench_snapshot.py --testcases 200000
+"""
+
+import argparse
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+from junitparser import JUnitXml, read_snapshot
+from synthetic import write_report
+
+
+def resident_size():
+    """The resident set size of the process in bytes, on Linux."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure(mode, path):
+    before = resident_size()
+    start = time.perf_counter()
+    if mode == "tree":
+        xml = JUnitXml.fromfile(path)
+        kept = [case for suite in xml for case in suite]
+    else:
+        kept = read_snapshot(path)
+    elapsed = time.perf_counter() - start
+    print(f"{mode:>13}: {(resident_size() - before) / 2**20:7.1f} MiB, {elapsed:5.2f}s")
+    return kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--testcases", type=int, default=200_000)
+    parser.add_argument("--mode", choices=["tree", "read_snapshot"])
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        measure(args.mode, args.path)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xml")
+        write_report(path, args.testcases)
+        for mode in ("tree", "read_snapshot"):
+            subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--path", path], check=True
+            )
+        xml = JUnitXml.fromfile(path)
+        start = time.perf_counter()
+        snapshot = xml.snapshot()
+        print(f"   snapshot(): {time.perf_counter() - start:5.2f}s from the tree")
+
+    start = time.perf_counter()
+    data = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+    dumped = time.perf_counter() - start
+    start = time.perf_counter()
+    pickle.loads(data)
+    loaded = time.perf_counter() - start
+    print(
+        f"       pickle: {len(data) / 2**20:7.1f} MiB, "
+        f"dumped in {dumped:5.2f}s, loaded in {loaded:5.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Time of looking up testcases by classname and name in a report.
+
+Run with::
+
+    python benchmarks/bench_testcase_lookup.py --testcases 200000 --lookups 100000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from junitparser import JUnitXml
+from synthetic import write_report
+
+
+def scan(xml, classname, name):
+    for suite in xml:
+        for case in suite:
+            if case.classname == classname and case.name == name:
+                return case
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--testcases", type=int, default=20_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xml")
+        write_report(path, args.testcases)
+        xml = JUnitXml.fromfile(path)
+
+    random.seed(0)
+    keys = []
+    for _ in range(args.lookups):
+        index = random.randrange(args.testcases)
+        keys.append((f"pkg.module{index % 100}.TestClass", f"test_{index}"))
+
+    scanned = keys[: max(1, args.lookups // 100)]
+    start = time.perf_counter()
+    for classname, name in scanned:
+        assert scan(xml, classname, name) is not None
+    elapsed = time.perf_counter() - start
+    print(f"  scan: {elapsed / len(scanned) * 1e6:10.1f}us per lookup")
+
+    start = time.perf_counter()
+    for classname, name in keys:
+        assert xml.find(classname, name) is not None
+    elapsed = time.perf_counter() - start
+    print(
+        f" index: {elapsed / len(keys) * 1e6:10.1f}us per lookup, including the build"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Time of extracting the names, times and statuses of all testcases of a report.
+
+Run with::
+
+    python benchmarks/bench_to_columns.py --testcases 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from junitparser import JUnitXml
+from synthetic import write_report
+
+
+def by_objects(xml):
+    rows = []
+    for suite in xml:
+        for case in suite:
+            rows.append((suite.name, case.classname, case.name, case.time, case.status))
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--testcases", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xml")
+        write_report(path, args.testcases)
+        xml = JUnitXml.fromfile(path)
+
+    for label, extract in (
+        ("objects", by_objects),
+        ("columns", lambda xml: len(xml.to_columns())),
+    ):
+        start = time.perf_counter()
+        count = extract(xml)
+        elapsed = time.perf_counter() - start
+        print(f"{label}: {elapsed:6.2f}s for {count} testcases")
+
+
+if __name__ == "__main__":
+    main()
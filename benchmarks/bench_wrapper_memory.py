@@ -0,0 +1,51 @@
+"""Memory of a wrapper for each testcase of a large report, and attribute reads.
+
+Run with::
+
+    python benchmarks/bench_wrapper_memory.py --testcases 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from junitparser import JUnitXml
+from synthetic import write_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--testcases", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xml")
+        write_report(path, args.testcases)
+        xml = JUnitXml.fromfile(path)
+
+    # lxml creates a proxy for each element on access, which would be counted
+    # along with the wrappers. Keep the elements alive to count the wrappers only.
+    elems = [elem for elem in xml._elem.iter("testcase")]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    cases = [case for suite in xml for case in suite]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(10):
+        for case in cases:
+            case._elem
+    access = time.perf_counter() - start
+    print(
+        f"{len(cases)} wrappers: {(after - before) / 2**20:7.1f} MiB, "
+        f"{(after - before) / len(cases):5.1f} bytes each; "
+        f"{10 * len(cases)} attribute reads in {access:5.2f}s"
+    )
+    del elems
+
+
+if __name__ == "__main__":
+    main()
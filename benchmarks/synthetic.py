@@ -0,0 +1,38 @@
+"""Generate synthetic JUnit XML reports for the benchmarks."""
+
+from xml.sax.saxutils import escape
+
+
+def write_report(path, testcases: int, output_size: int = 0, suite_size: int = 1000):
+    """Write a report with *testcases* testcases to *path*.
+
+    Every 10th testcase fails and every 20th is skipped. Each testcase captures
+    *output_size* bytes of system-out.
+    """
+    output = escape("x" * (output_size - 1) + "\n") if output_size else ""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n')
+        for index in range(testcases):
+            if index % suite_size == 0:
+                if index:
+                    f.write("</testsuite>\n")
+                f.write(f'<testsuite name="suite{index // suite_size}">\n')
+            f.write(
+                f'<testcase classname="pkg.module{index % 100}.TestClass" '
+                f'name="test_{index}" time="{index % 1000 / 1000}">'
+            )
+            if index % 10 == 0:
+                f.write('<failure message="assert 1 == 2">AssertionError</failure>')
+            elif index % 20 == 5:
+                f.write('<skipped message="not relevant"/>')
+            if output:
+                f.write(f"<system-out>{output}</system-out>")
+            f.write("</testcase>\n")
+        if testcases:
+            f.write("</testsuite>\n")
+        f.write("</testsuites>\n")
+
+
+def testcases_for_size(size: int, output_size: int) -> int:
+    """The number of testcases for a report of roughly *size* bytes."""
+    return max(1, size // (output_size + 140))
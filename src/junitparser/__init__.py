@@ -2,6 +2,8 @@ from importlib.metadata import version as _dist_version
 
 from .junitparser import (
     Attr,
+    CaseRecord,
+    Columns,
     Element,
     Error,
     Failure,
@@ -9,19 +11,29 @@ from .junitparser import (
     IntAttr,
     JUnitXml,
     JUnitXmlError,
+    JUnitXmlPullParser,
     Properties,
     Property,
     Skipped,
+    Snapshot,
+    Statistics,
+    Status,
+    SuiteRecord,
     SystemOut,
     SystemErr,
     TestCase,
     TestSuite,
+    get_parser,
+    read_snapshot,
+    read_statistics,
 )
 
 version = _dist_version("junitparser")
 
 __all__ = [
     "Attr",
+    "CaseRecord",
+    "Columns",
     "Element",
     "Error",
     "Failure",
@@ -29,12 +41,20 @@ __all__ = [
     "IntAttr",
     "JUnitXml",
     "JUnitXmlError",
+    "JUnitXmlPullParser",
     "Properties",
     "Property",
     "Skipped",
+    "Snapshot",
+    "Statistics",
+    "Status",
+    "SuiteRecord",
     "SystemOut",
     "SystemErr",
     "TestCase",
     "TestSuite",
+    "get_parser",
+    "read_snapshot",
+    "read_statistics",
     "version",
 ]
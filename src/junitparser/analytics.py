@@ -0,0 +1,236 @@
+"""
+Duration distributions and status counts of the testcases of a report, per
+testsuite, per classname or overall.
+
+The testcases are read as :class:`~junitparser.Columns`, and the numbers are
+computed with NumPy if it is installed, or with the standard library otherwise.
+"""
+
+import math
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .junitparser import Columns, JUnitXml, Status
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class DurationSummary:
+    """The durations and statuses of a group of testcases.
+
+    Attributes:
+        count: Number of testcases.
+        total: Sum of the known times.
+        percentiles: The percentiles of the known times by percent, NaN if no
+            time is known.
+        histogram: The numbers of known times in equal-width bins between the
+            smallest and the largest time, and the edges of the bins, like
+            ``numpy.histogram``.
+        statuses: Number of testcases by :class:`~junitparser.Status`.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        total: float,
+        percentiles: Dict[float, float],
+        histogram: Tuple[List[int], List[float]],
+        statuses: Dict[Status, int],
+    ):
+        self.count = count
+        self.total = total
+        self.percentiles = percentiles
+        self.histogram = histogram
+        self.statuses = statuses
+
+    def __repr__(self):
+        return "<DurationSummary count=%d total=%s percentiles=%s>" % (
+            self.count,
+            self.total,
+            self.percentiles,
+        )
+
+    def todict(self) -> dict:
+        """Convert the summary to a dict, e.g. to serialize it as JSON."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "percentiles": dict(self.percentiles),
+            "histogram": {"counts": self.histogram[0], "edges": self.histogram[1]},
+            "statuses": {
+                status.value: count for status, count in self.statuses.items()
+            },
+        }
+
+
+# The columns of Columns that testcases can be grouped by.
+GROUP_BY = ("suite", "classname", "name")
+
+
+def summarize(
+    report: Union[JUnitXml, Columns],
+    by: Optional[str] = "suite",
+    percentiles: Sequence[float] = (50, 95, 99),
+    bins: int = 10,
+) -> Dict[Optional[str], DurationSummary]:
+    """Summarize the durations and statuses of the testcases of *report*.
+
+    The testcases are grouped by their testsuite, classname or name, as *by*
+    is ``"suite"``, ``"classname"`` or ``"name"``, or all in one group with the
+    key ``None`` if *by* is ``None``. *report* is a :class:`JUnitXml` or the
+    :class:`~junitparser.Columns` of one, and *bins* is the number of bins of
+    the histograms.
+
+    Returns the :class:`DurationSummary` of each group, in the order the
+    groups first appear.
+    """
+    if by is not None and by not in GROUP_BY:
+        raise ValueError("Cannot group testcases by %r." % (by,))
+    if isinstance(report, JUnitXml):
+        report = report.to_columns()
+    groups = {}
+    if by is None:
+        codes = array("q", bytes(8 * len(report)))
+        if len(report):
+            groups[None] = 0
+    else:
+        codes = array(
+            "q", (groups.setdefault(key, len(groups)) for key in getattr(report, by))
+        )
+    summarize_groups = _summarize_numpy if numpy is not None else _summarize_python
+    return dict(
+        zip(groups, summarize_groups(report, codes, len(groups), percentiles, bins))
+    )
+
+
+def _summarize_numpy(columns, codes, size, percentiles, bins):
+    """Summarize the testcases of *columns* in the *size* groups *codes* with
+    NumPy, computing the numbers of all groups at once.
+    """
+    codes = numpy.frombuffer(codes, dtype=numpy.int64)
+    times = numpy.frombuffer(columns.time, dtype=numpy.float64)
+    statuses = numpy.frombuffer(columns.status, dtype=numpy.uint8)
+    width = len(Columns.STATUSES)
+    counts = numpy.bincount(codes, minlength=size)
+    status_counts = numpy.bincount(
+        codes * width + statuses, minlength=size * width
+    ).reshape(size, width)
+
+    known = ~numpy.isnan(times)
+    codes, times = codes[known], times[known]
+    totals = numpy.bincount(codes, weights=times, minlength=size)
+    known_counts = numpy.bincount(codes, minlength=size)
+    empty = known_counts == 0
+    # The known times sorted by group and then by time, and where each
+    # group starts and ends, clipped to stay in bounds for empty groups.
+    order = numpy.lexsort((times, codes))
+    codes, times = codes[order], times[order]
+    padded = times if times.size else numpy.zeros(1)
+    starts = numpy.cumsum(known_counts) - known_counts
+    ends = numpy.maximum(starts + known_counts - 1, 0)
+    starts = numpy.minimum(starts, padded.size - 1)
+
+    values = []
+    for percent in percentiles:
+        position = numpy.maximum(known_counts - 1, 0) * (percent / 100)
+        lower = numpy.floor(position).astype(numpy.int64)
+        low = padded[starts + lower]
+        high = padded[numpy.minimum(starts + lower + 1, ends)]
+        value = low + (high - low) * (position - lower)
+        value[empty] = math.nan
+        values.append(value.tolist())
+
+    # Equal-width bins between the smallest and largest time of each group,
+    # assigned like numpy.histogram does.
+    first = numpy.where(empty, 0.0, padded[starts])
+    last = numpy.where(empty, 1.0, padded[ends])
+    same = first == last
+    first = numpy.where(same, first - 0.5, first)
+    last = numpy.where(same, last + 0.5, last)
+    edges = first[:, None] + numpy.arange(bins + 1) * ((last - first) / bins)[:, None]
+    edges[:, -1] = last
+    group_first, group_last = first[codes], last[codes]
+    indexes = numpy.floor(
+        (times - group_first) * bins / (group_last - group_first)
+    ).astype(numpy.int64)
+    indexes = numpy.clip(indexes, 0, bins - 1)
+    indexes -= times < edges[codes, indexes]
+    indexes += (times >= edges[codes, indexes + 1]) & (indexes != bins - 1)
+    histograms = numpy.bincount(codes * bins + indexes, minlength=size * bins)
+    histograms = histograms.reshape(size, bins).tolist()
+    edges = edges.tolist()
+
+    counts, totals, status_counts = (
+        counts.tolist(),
+        totals.tolist(),
+        status_counts.tolist(),
+    )
+    for code in range(size):
+        yield DurationSummary(
+            counts[code],
+            totals[code],
+            {percent: value[code] for percent, value in zip(percentiles, values)},
+            (histograms[code], edges[code]),
+            _statuses(status_counts[code]),
+        )
+
+
+def _summarize_python(columns, codes, size, percentiles, bins):
+    """Summarize the testcases of *columns* in the *size* groups *codes*."""
+    width = len(Columns.STATUSES)
+    counts = [0] * size
+    status_counts = [0] * (size * width)
+    groups = [[] for _ in range(size)]
+    for code, time, status in zip(codes, columns.time, columns.status):
+        counts[code] += 1
+        status_counts[code * width + status] += 1
+        if time == time:
+            groups[code].append(time)
+    for code, group in enumerate(groups):
+        group.sort()
+        yield DurationSummary(
+            counts[code],
+            math.fsum(group),
+            {percent: _percentile(group, percent) for percent in percentiles},
+            _histogram(group, bins),
+            _statuses(status_counts[code * width : (code + 1) * width]),
+        )
+
+
+def _statuses(counts: List[int]) -> Dict[Status, int]:
+    """The counts of each status, from the counts by status code."""
+    return dict(zip(Columns.STATUSES, counts))
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """The *percent* percentile of the sorted *values*, interpolated linearly
+    like ``numpy.percentile``.
+    """
+    if not values:
+        return math.nan
+    position = (len(values) - 1) * percent / 100
+    index = math.floor(position)
+    if index + 1 >= len(values):
+        return values[-1]
+    lower = values[index]
+    return lower + (values[index + 1] - lower) * (position - index)
+
+
+def _histogram(values: List[float], bins: int) -> Tuple[List[int], List[float]]:
+    """The histogram of the sorted *values* in *bins* bins, like ``numpy.histogram``."""
+    if values:
+        first, last = values[0], values[-1]
+    else:
+        first, last = 0.0, 1.0
+    if first == last:
+        first, last = first - 0.5, last + 0.5
+    step = (last - first) / bins
+    edges = [first + index * step for index in range(bins)] + [last]
+    counts = [0] * bins
+    for value in values:
+        counts[min(bisect_right(edges, value) - 1, bins - 1)] += 1
+    return counts, edges
@@ -1,16 +1,37 @@
+import json
+import os
+import shutil
 import sys
+import tarfile
+import tempfile
+import zipfile
 from argparse import ArgumentParser
+from contextlib import closing
+from copy import deepcopy
 from glob import iglob
 from itertools import chain
+from xml.sax.saxutils import quoteattr
 
-from . import JUnitXml, version
+from . import (
+    JUnitXml,
+    JUnitXmlPullParser,
+    Statistics,
+    get_parser,
+    read_statistics,
+    version,
+)
+from .junitparser import _tail, etree
 
+# Room reserved in the <testsuites> start tag for the statistics, which are only
+# known once all the reports have been streamed to the output.
+_STATS_WIDTH = 160
 
-def merge(paths, output, suite_name=""):
-    """Merge XML reports."""
+
+def merge(paths, output, suite_name="", parser=None):
+    """Merge XML reports, read with the XML *parser*."""
     result = JUnitXml()
     for path in paths:
-        result += JUnitXml.fromfile(path)
+        result += JUnitXml.fromfile(path, parser=parser)
 
     result.update_statistics()
     if suite_name:
@@ -19,20 +40,144 @@ def merge(paths, output, suite_name=""):
     return 0
 
 
-def verify(paths):
+def merge_stream(paths, output, suite_name="", parser=None):
+    """Merge XML reports by streaming their testsuites straight to *output*.
+
+    Only one testsuite is held in memory at a time. Unlike :func:`merge`,
+    testsuites sharing the same name are not combined.
+    """
+    if output == "-":
+        # The root statistics go before the testsuites, and stdout can't be
+        # rewound to fill them in, so spool the testsuites to a temporary file.
+        with tempfile.TemporaryFile() as body:
+            statistics = _write_testsuites(paths, body, parser)
+            body.seek(0)
+            out = sys.stdout.buffer
+            out.write(_root_start_tag(suite_name, statistics))
+            shutil.copyfileobj(body, out)
+            out.write(b"</testsuites>\n")
+            out.flush()
+        return 0
+
+    with open(output, "wb") as out:
+        out.write(_root_start_tag(suite_name, None))
+        statistics = _write_testsuites(paths, out, parser)
+        out.write(b"</testsuites>\n")
+        out.seek(0)
+        out.write(_root_start_tag(suite_name, statistics))
+    return 0
+
+
+def _write_testsuites(paths, out, parser=None):
+    """Write the testsuites of all *paths* to *out*, returning the root statistics."""
+    statistics = Statistics()
+    for path in paths:
+        for suite in JUnitXml.itersuites(path, parser):
+            suite.update_statistics()
+            statistics += Statistics(
+                suite.tests, suite.failures, suite.errors, suite.skipped, suite.time
+            )
+            suite._elem.tail = None
+            out.write(etree.tostring(suite._elem, encoding="utf-8"))
+            out.write(b"\n")
+    return statistics
+
+
+def _root_start_tag(suite_name, statistics):
+    """The XML declaration and <testsuites> start tag, padded to a fixed length."""
+    attrs = f" name={quoteattr(suite_name)}" if suite_name else ""
+    head = f"<?xml version='1.0' encoding='utf-8'?>\n<testsuites{attrs}".encode()
+    body = b""
+    if statistics is not None:
+        body = "".join(
+            f' {key}="{value}"' for key, value in statistics.todict().items()
+        ).encode()
+    return head + body.ljust(_STATS_WIDTH) + b">\n"
+
+
+def verify(paths, parser=None):
     """Verify if none of the testcases failed or errored."""
     # We could grab the number of failures and errors from the statistics of the root element
     # or from the test suites elements, but those attributes are not guaranteed to be present
-    # or correct. So we'll just loop over all the testcases.
+    # or correct. So we'll just loop over all the testcases. They are streamed one at a time,
+    # so we neither build whole trees nor read any further than the first failing testcase.
     for path in paths:
-        xml = JUnitXml.fromfile(path)
-        for suite in xml:
-            for case in suite:
+        with closing(JUnitXml.iterfile(path, parser)) as cases:
+            for _, case in cases:
                 if not case.is_passed and not case.is_skipped:
                     return 1
     return 0
 
 
+def stats(paths):
+    """Print the statistics of each XML report and their total as JSON."""
+    files = {}
+    total = Statistics()
+    for path in paths:
+        statistics = read_statistics(path)
+        files[str(path)] = statistics.todict()
+        total += statistics
+    json.dump({"files": files, "total": total.todict()}, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+def follow_stats(paths, timeout=None, interval=1.0, parser=None):
+    """Follow XML reports being written, printing their statistics as JSON lines.
+
+    A line is printed each time the statistics of a report change. The reports
+    are followed one after the other until they are complete. If a report
+    isn't complete after *timeout* seconds without new data, the reports left
+    are not followed and 1 is returned.
+    """
+    for path in paths:
+        pull_parser = JUnitXmlPullParser(parser=parser)
+        printed = None
+        with closing(_tail(path, interval, timeout)) as chunks:
+            for chunk in chunks:
+                pull_parser.feed(chunk)
+                for _ in pull_parser.read_events():
+                    pass
+                if pull_parser.statistics != printed:
+                    printed = deepcopy(pull_parser.statistics)
+                    json.dump({"file": str(path), **printed.todict()}, sys.stdout)
+                    sys.stdout.write("\n")
+                    sys.stdout.flush()
+                if pull_parser.complete:
+                    break
+            else:
+                print(
+                    f"Timed out following {path}, which is not complete.",
+                    file=sys.stderr,
+                )
+                return 1
+    return 0
+
+
+def _expand_glob(path):
+    """Expand a glob, leaving the member glob of ``archive!member`` paths to the
+    parser, which reads the archive once for all members.
+
+    A ``!`` only separates the member if the glob before it matches zip or tar
+    files, as it also negates the character classes of globs, like ``[!s]``.
+    """
+    index = path.find("!")
+    while index != -1:
+        archives = [match for match in iglob(path[:index]) if _is_archive(match)]
+        if archives:
+            member = path[index + 1 :]
+            return (f"{archive}!{member}" for archive in archives)
+        index = path.find("!", index + 1)
+    return iglob(path)
+
+
+def _is_archive(path):
+    """Whether *path* is a zip or tar file."""
+    return os.path.isfile(path) and (
+        zipfile.is_zipfile(path) or tarfile.is_tarfile(path)
+    )
+
+
 def _parser(prog_name=None):  # pragma: no cover
     """Create the CLI arg parser."""
     parser = ArgumentParser(description="Junitparser CLI helper.", prog=prog_name)
@@ -53,7 +198,19 @@ def _parser(prog_name=None):  # pragma: no cover
         action="store_true",
         default=False,
     )
-    abstract_parser.add_argument("paths", help="Original XML path(s).", nargs="+")
+    abstract_parser.add_argument(
+        "paths",
+        help="Original XML path(s). Reports in zip or tar archives can be read "
+        "with a path like artifacts.zip!**/TEST-*.xml.",
+        nargs="+",
+    )
+    abstract_parser.add_argument(
+        "--huge-tree",
+        help="Lift the limits of lxml on the size of texts and on the depth of "
+        "the reports, e.g. for very large captured outputs.",
+        action="store_true",
+        default=False,
+    )
 
     # command: merge
     merge_parser = command_parser.add_parser(
@@ -68,6 +225,13 @@ def _parser(prog_name=None):  # pragma: no cover
         "--suite-name",
         help="Name added to <testsuites>.",
     )
+    merge_parser.add_argument(
+        "--stream",
+        help="Stream testsuites to the output one at a time instead of loading "
+        "all reports into memory. Testsuites with the same name are not combined.",
+        action="store_true",
+        default=False,
+    )
 
     # command: verify
     verify_parser = command_parser.add_parser(  # noqa: F841
@@ -76,6 +240,25 @@ def _parser(prog_name=None):  # pragma: no cover
         parents=[abstract_parser],
     )
 
+    # command: stats
+    stats_parser = command_parser.add_parser(
+        "stats",
+        help="Print the test counts and time of the reports as JSON.",
+        parents=[abstract_parser],
+    )
+    stats_parser.add_argument(
+        "--follow",
+        help="Follow reports that are still being written, printing a JSON line "
+        "each time their counts change, until they are complete.",
+        action="store_true",
+        default=False,
+    )
+    stats_parser.add_argument(
+        "--timeout",
+        help="With --follow, give up after TIMEOUT seconds without new data.",
+        type=float,
+    )
+
     return parser
 
 
@@ -83,12 +266,19 @@ def main(args=None, prog_name=None):
     """CLI's main runner."""
     args = _parser(prog_name=prog_name).parse_args(args)
     paths = (
-        chain.from_iterable(iglob(path) for path in args.paths)
+        chain.from_iterable(_expand_glob(path) for path in args.paths)
         if args.paths_are_globs
         else args.paths
     )
+    xml_parser = get_parser(huge_tree=True) if args.huge_tree else None
     if args.command == "merge":
-        return merge(paths, args.output, args.suite_name)
+        if args.stream:
+            return merge_stream(paths, args.output, args.suite_name, xml_parser)
+        return merge(paths, args.output, args.suite_name, xml_parser)
     if args.command == "verify":
-        return verify(paths)
+        return verify(paths, xml_parser)
+    if args.command == "stats":
+        if args.follow:
+            return follow_stats(paths, args.timeout, parser=xml_parser)
+        return stats(paths)
     return 255
@@ -9,11 +9,25 @@ This, according to the document, is Apache Ant's JUnit output.
 See the documentation for other supported schemas.
 """
 
+import fnmatch
+import inspect
 import io
 import itertools
+import math
+import os
+import tarfile
+import threading
+import time
+import weakref
+import zipfile
+from array import array
+from contextlib import closing, contextmanager
 from copy import deepcopy
+from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Union, Iterator, IO, Optional
+from typing import Callable, List, NamedTuple, Tuple, Union, Iterator, IO, Optional
+from xml.parsers import expat
 
 try:
     from lxml import etree
@@ -27,6 +41,7 @@ def write_xml(
     *,
     pretty: bool = False,
 ):
+    _load_texts(obj._elem)
     tree = etree.ElementTree(obj._elem)
     if file_or_filename is None:
         file_or_filename = obj.filepath
@@ -71,6 +86,383 @@ def write_xml(
             tree.write(file_or_filename, encoding="utf-8", xml_declaration=True)
 
 
+# Magic bytes of the compression formats that are decompressed transparently.
+_COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "lzma",
+}
+
+
+def _compression(fileobj) -> Optional[str]:
+    """Detect the compression of a binary file object from its magic bytes.
+
+    Nothing is consumed from *fileobj*. File objects that can be neither peeked
+    nor rewound are assumed to be uncompressed.
+    """
+    if hasattr(fileobj, "peek"):
+        head = fileobj.peek(6)[:6]
+    elif hasattr(fileobj, "seekable") and fileobj.seekable():
+        position = fileobj.tell()
+        head = fileobj.read(6)
+        fileobj.seek(position)
+    else:
+        return None
+    if not isinstance(head, bytes):
+        return None
+    for magic, compression in _COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _decompress(fileobj, compression: str):
+    """Wrap *fileobj* in a stream decompressing it on the fly."""
+    if compression == "gzip":
+        import gzip
+
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+    if compression == "bz2":
+        import bz2
+
+        return bz2.BZ2File(fileobj, mode="rb")
+    import lzma
+
+    return lzma.LZMAFile(fileobj, mode="rb")
+
+
+@contextmanager
+def _decompressed(file: Union[str, os.PathLike, IO]):
+    """Yield a decompressing stream if *file* is compressed, otherwise *file* itself.
+
+    Compression is detected by magic bytes for local paths and binary file
+    objects, so that names, URLs and other inputs are passed through as is.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        if not os.path.isfile(file):
+            yield file
+            return
+        with open(file, "rb") as fileobj:
+            compression = _compression(fileobj)
+            if compression is None:
+                yield file
+                return
+            with _decompress(fileobj, compression) as source:
+                yield source
+        return
+
+    compression = _compression(file)
+    if compression is None:
+        yield file
+        return
+    with _decompress(file, compression) as source:
+        yield source
+
+
+def _split_archive_path(file) -> Optional[Tuple[str, str]]:
+    """Split an ``archive!member`` path into the archive and the member name or glob.
+
+    Returns ``None`` if *file* is not such a path.
+    """
+    if not isinstance(file, (str, os.PathLike)):
+        return None
+    file = os.fspath(file)
+    if "!" not in file or os.path.exists(file):
+        return None
+    index = file.find("!")
+    while index != -1:
+        if os.path.isfile(file[:index]):
+            return file[:index], file[index + 1 :]
+        index = file.find("!", index + 1)
+    return None
+
+
+def _match_member(name: str, pattern: str) -> bool:
+    """Whether the archive member *name* matches the glob *pattern*.
+
+    Like with ``fnmatch``, ``*`` also matches slashes. A leading ``**/`` also
+    matches members at the top of the archive.
+    """
+    if name.startswith("./"):
+        name = name[2:]
+    if fnmatch.fnmatchcase(name, pattern):
+        return True
+    return pattern.startswith("**/") and fnmatch.fnmatchcase(name, pattern[3:])
+
+
+def _iter_archive(archive: str, member: str):
+    """Yield a stream for each file of a zip or tar *archive* matching *member*.
+
+    The archive is read in a single pass, and the members are decompressed on
+    the fly instead of being extracted.
+    """
+    is_glob = any(char in member for char in "*?[")
+    found = False
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zip_file:
+            for info in zip_file.infolist():
+                if info.is_dir() or not _match_member(info.filename, member):
+                    continue
+                found = True
+                with zip_file.open(info) as fileobj, _decompressed(fileobj) as source:
+                    yield source
+                if not is_glob:
+                    break
+    elif tarfile.is_tarfile(archive):
+        # Stream mode reads the archive sequentially, which avoids seeking
+        # backwards in compressed archives.
+        with tarfile.open(archive, mode="r|*") as tar_file:
+            for info in tar_file:
+                if not info.isfile() or not _match_member(info.name, member):
+                    continue
+                found = True
+                with (
+                    tar_file.extractfile(info) as fileobj,
+                    _decompressed(fileobj) as source,
+                ):
+                    yield source
+                if not is_glob:
+                    break
+    else:
+        raise JUnitXmlError(f"Not a zip or tar archive: {archive}")
+    if not found:
+        raise FileNotFoundError(f"No member of {archive} matches {member}")
+
+
+def _iter_sources(file: Union[str, os.PathLike, IO]):
+    """Yield a stream for each report of *file*, which may be an archive path.
+
+    See :func:`_open_source`.
+    """
+    archive = _split_archive_path(file)
+    if archive is None:
+        with _open_source(file) as source:
+            yield source
+    else:
+        yield from _iter_archive(*archive)
+
+
+@contextmanager
+def _open_source(file: Union[str, os.PathLike, IO]):
+    """Open *file* for incremental reading, closing it afterwards if we opened it.
+
+    Compressed files are decompressed on the fly. An ``archive!member`` path
+    opens the first member of a zip or tar archive matching the name or glob
+    *member*. Other file objects and file-like objects are passed through
+    untouched.
+    """
+    archive = _split_archive_path(file)
+    if archive is not None:
+        with closing(_iter_archive(*archive)) as sources:
+            yield next(sources)
+    elif isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as fileobj, _decompressed(fileobj) as source:
+            yield source
+    else:
+        with _decompressed(file) as source:
+            yield source
+
+
+# Configured lxml parsers, cached per thread as they can't be used concurrently.
+_parsers = threading.local()
+
+
+class _XMLParser(etree.XMLParser):
+    """An XML parser keeping its *options*, to set up pull parsers alike."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.options = options
+
+
+def get_parser(
+    *,
+    huge_tree: bool = False,
+    remove_blank_text: bool = False,
+    resolve_entities: bool = False,
+    no_network: bool = True,
+):
+    """Get an XML parser to pass to ``fromfile`` or ``fromstring``.
+
+    With lxml, the parser is an ``lxml.etree.XMLParser`` with the given
+    options, created once per thread and per combination of options, so that
+    parsing many files doesn't set up a new parser for each of them:
+
+    - *huge_tree* lifts the limits of lxml on the size of text nodes and on
+      the depth of the tree, e.g. for very large captured outputs.
+    - *remove_blank_text* drops the whitespace between elements.
+    - *resolve_entities* resolves the entities declared in the document type.
+    - *no_network* forbids accessing the network to read external documents.
+
+    The parser can also be passed to the methods reading reports incrementally,
+    like ``iterfile`` and ``itersuites``, and to :class:`JUnitXmlPullParser`,
+    which set up their pull parsers with the same options.
+
+    With the standard library, a new ``xml.etree.ElementTree.XMLParser`` is
+    returned each time. It has no size limits, neither resolves external
+    entities nor accesses the network, and can't remove blank text.
+    """
+    if etree.__name__ != "lxml.etree":
+        if remove_blank_text:
+            raise ValueError("remove_blank_text requires lxml.")
+        return etree.XMLParser()
+    key = (huge_tree, remove_blank_text, resolve_entities, no_network)
+    cache = getattr(_parsers, "cache", None)
+    if cache is None:
+        cache = _parsers.cache = {}
+    parser = cache.get(key)
+    if parser is None:
+        parser = cache[key] = _XMLParser(
+            huge_tree=huge_tree,
+            remove_blank_text=remove_blank_text,
+            resolve_entities=resolve_entities,
+            no_network=no_network,
+        )
+    return parser
+
+
+def _get_parser_options(parser) -> dict:
+    """The options of *parser*, which must have been made by :func:`get_parser`.
+
+    The parsers of the standard library have no options.
+    """
+    if etree.__name__ != "lxml.etree":
+        return {}
+    if not isinstance(parser, _XMLParser):
+        raise ValueError("parser must be made by get_parser.")
+    return parser.options
+
+
+def _pull_parser(parser=None):
+    """A pull parser of start and end events, configured like *parser*."""
+    options = {} if parser is None else _get_parser_options(parser)
+    return etree.XMLPullParser(events=("start", "end"), **options)
+
+
+def _fromstring(text, chunk_size: int = 64 * 1024, parser=None):
+    """Parse XML from a string or any object supporting the buffer protocol.
+
+    Buffers are fed to the parser in chunks, so at most *chunk_size* bytes are
+    copied at a time instead of the whole buffer.
+    """
+    if isinstance(text, (str, bytes)):
+        return etree.fromstring(text, parser)  # nosec
+    if parser is None:
+        parser = etree.XMLParser()
+    with memoryview(text) as view, view.cast("B") as data:
+        for start in range(0, len(data), chunk_size):
+            parser.feed(data[start : start + chunk_size].tobytes())
+    return parser.close()
+
+
+def _iterparse(source, chunk_size: int = 64 * 1024, parser=None):
+    """Incrementally parse *source*, yielding ``(event, elem)`` start/end events.
+
+    Unlike ``etree.iterparse``, this accepts file-like objects returning either
+    bytes or str with both the lxml and the standard library backends. The
+    events are read with the options of *parser*, see :func:`_pull_parser`.
+    """
+    parser = _pull_parser(parser)
+    while True:
+        data = source.read(chunk_size)
+        if not data:
+            break
+        parser.feed(data)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def _tail(
+    path: Union[str, os.PathLike],
+    interval: float,
+    timeout: Optional[float],
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """Yield the data appended to the file *path*, polling every *interval* seconds.
+
+    Stops after *timeout* seconds without new data, unless *timeout* is ``None``.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    fileobj = None
+    try:
+        while True:
+            if fileobj is None:
+                try:
+                    fileobj = open(path, "rb")
+                except FileNotFoundError:
+                    pass
+            data = fileobj.read(chunk_size) if fileobj is not None else b""
+            if data:
+                if timeout is not None:
+                    deadline = time.monotonic() + timeout
+                yield data
+            elif deadline is not None and time.monotonic() >= deadline:
+                return
+            else:
+                time.sleep(interval)
+    finally:
+        if fileobj is not None:
+            fileobj.close()
+
+
+# Attribute recording where the text of an element parsed with ``lazy_text`` is
+# in the source file, as "<byte offset> <byte length> <absolute path>".
+_LAZY_TEXT = "{https://github.com/weiwei/junitparser}lazy-text"
+
+
+def _get_text(elem) -> Optional[str]:
+    """The text of *elem*, read from the source file if it was left out."""
+    lazy = elem.get(_LAZY_TEXT)
+    if lazy is None:
+        return elem.text
+    start, length, path = lazy.split(" ", 2)
+    with open(path, "rb") as fileobj:
+        fileobj.seek(int(start))
+        data = fileobj.read(int(length))
+    # The text may hold entities and CDATA sections. It was read by expat,
+    # which has no size limits, so lxml must not have any either.
+    parser = get_parser(huge_tree=True)
+    return etree.fromstring(b"<text>" + data + b"</text>", parser).text  # nosec
+
+
+def _set_text(elem, value: Optional[str]):
+    """Set the text of *elem*, forgetting where it was in the source file."""
+    if _LAZY_TEXT in elem.attrib:
+        del elem.attrib[_LAZY_TEXT]
+    elem.text = value
+
+
+def _attrib(elem) -> dict:
+    """The attributes of *elem*, without the position of a text left out."""
+    attrib = dict(elem.attrib)
+    attrib.pop(_LAZY_TEXT, None)
+    return attrib
+
+
+def _elements_equal(elem, other) -> bool:
+    """Whether *elem* and *other* have the same content, ignoring their tails."""
+    if (
+        elem.tag != other.tag
+        or len(elem) != len(other)
+        or _attrib(elem) != _attrib(other)
+        or (_get_text(elem) or "") != (_get_text(other) or "")
+    ):
+        return False
+    return all(
+        (child.tail or "") == (other_child.tail or "")
+        and _elements_equal(child, other_child)
+        for child, other_child in zip(elem, other)
+    )
+
+
+def _load_texts(elem):
+    """Read the texts left out of *elem* and its descendants, e.g. to write them."""
+    for descendant in elem.iter():
+        if _LAZY_TEXT in descendant.attrib:
+            _set_text(descendant, _get_text(descendant))
+
+
 class JUnitXmlError(Exception):
     """Exception for JUnit XML related errors."""
 
@@ -93,8 +485,9 @@ class Attr(object):
 
     def __set__(self, instance, value: str):
         """Sets XML element attribute."""
-        if value is not None:
-            instance._elem.attrib[self.name] = str(value)
+        if value is None:
+            return
+        instance._elem.attrib[self.name] = str(value)
 
 
 class IntAttr(Attr):
@@ -107,7 +500,7 @@ class IntAttr(Attr):
     def __get__(self, instance, cls):
         result = super().__get__(instance, cls)
         if result is None and isinstance(instance, (JUnitXml, TestSuite)):
-            instance.update_statistics()
+            instance._update_statistics()
             result = super().__get__(instance, cls)
         return int(result) if result else None
 
@@ -127,7 +520,7 @@ class FloatAttr(Attr):
     def __get__(self, instance, cls):
         result = super().__get__(instance, cls)
         if result is None and isinstance(instance, (JUnitXml, TestSuite)):
-            instance.update_statistics()
+            instance._update_statistics()
             result = super().__get__(instance, cls)
         return float(result.replace(",", "")) if result else None
 
@@ -154,20 +547,196 @@ class junitxml(type):
         return cls
 
 
+class _Wrappers(dict):
+    """The identity map of a document: the objects wrapping its elements, by
+    class and element, so that iterating twice yields the same objects, see
+    :func:`_wrap`.
+
+    Each object keeps the map of the object it was found in or appended to,
+    while the map only keeps weak references to the objects, so that it goes
+    away with the last object of the document. The entry of an object goes
+    away with it, see :class:`_WrapperRefs`.
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+class _WrapperRefs(dict):
+    """Weak references to the objects of a class wrapping the elements of a
+    document, by element.
+
+    The references are ``KeyedRef`` whose callback removes their entry, so
+    that the elements of the objects that went away aren't kept alive.
+    """
+
+    __slots__ = ("__weakref__", "_remove")
+
+    def __init__(self):
+        self_ref = weakref.ref(self)
+
+        def remove(ref):
+            refs = self_ref()
+            # A new object may have replaced the one that went away already.
+            if refs is not None and refs.get(ref.key) is ref:
+                del refs[ref.key]
+
+        self._remove = remove
+
+    def add(self, instance: "Element"):
+        """Make *instance* the wrapper of its element."""
+        elem = instance._elem
+        self[elem] = weakref.KeyedRef(instance, self._remove, elem)
+
+
+def _document(obj: "Element") -> _Wrappers:
+    """The identity map of the document of *obj*, made on first use."""
+    wrappers = obj._wrappers
+    if wrappers is None:
+        wrappers = obj._wrappers = _Wrappers()
+        _wrappers_of(wrappers, type(obj)).add(obj)
+    return wrappers
+
+
+def _wrappers_of(wrappers: _Wrappers, cls) -> _WrapperRefs:
+    """The weak references to the objects of class *cls* in *wrappers*, by
+    element.
+    """
+    by_elem = wrappers.get(cls)
+    if by_elem is None:
+        by_elem = wrappers[cls] = _WrapperRefs()
+    return by_elem
+
+
+def _wrap(cls, elem, wrappers: _Wrappers):
+    """The object of class *cls* wrapping the element *elem* in *wrappers*."""
+    by_elem = _wrappers_of(wrappers, cls)
+    ref = by_elem.get(elem)
+    instance = ref() if ref is not None else None
+    if instance is None:
+        instance = _new_wrapper(cls, elem, wrappers)
+        by_elem.add(instance)
+    return instance
+
+
+def _new_wrapper(cls, elem, wrappers: Optional[_Wrappers] = None):
+    """A new object of class *cls* wrapping the element *elem*, whose identity
+    map is *wrappers*, if any yet, e.g. not for the elements streamed from a
+    file.
+    """
+    instance = cls()
+    instance._elem = elem
+    instance._parent = _unknown_parent
+    instance._wrappers = wrappers
+    return instance
+
+
+def _child(owner: "Element", cls, elem, parent=None):
+    """The object of class *cls* wrapping the element *elem* found in *owner*,
+    whose weak reference *parent* is, if given.
+    """
+    child = _wrap(cls, elem, _document(owner))
+    child._parent = parent if parent is not None else weakref.ref(owner)
+    return child
+
+
+def _remember_wrapper(wrappers: _Wrappers, instance: "Element"):
+    """Make *instance* the wrapper of its element in *wrappers*, unless it has
+    one already.
+    """
+    by_elem = _wrappers_of(wrappers, type(instance))
+    ref = by_elem.get(instance._elem)
+    if ref is None or ref() is None:
+        by_elem.add(instance)
+    if instance._wrappers is None:
+        instance._wrappers = wrappers
+
+
+def _forget_wrappers(ref):
+    # A new map may have replaced the dead one already.
+    if _passed.get(ref.key) is ref:
+        del _passed[ref.key]
+
+
+# The identity maps of the elements passed to fromelem by themselves, so that
+# passing an element again yields the same object as long as it is in use.
+_passed = {}
+
+
+# The slots that are neither copied nor pickled, as they refer to other objects
+# and elements of the tree, or are only valid in this process.
+_NOT_COPIED = (
+    "_parent",
+    "_wrappers",
+    "_statistics",
+    "_counted_at",
+    "_count",
+    "_last",
+    "_suites",
+    "_index",
+    "_indexed_at",
+    "_index_last",
+    "__weakref__",
+)
+
+
 class Element(metaclass=junitxml):
     """Base class for all JUnit XML elements."""
 
+    # The parent is a weak reference to the object the element was appended
+    # to or found in, ``None`` if the element was created and not appended
+    # since, or _unknown_parent, see :func:`_parent_of` and :func:`_propagate`.
+    # The wrappers are the identity map of the document, see :class:`_Wrappers`.
+    __slots__ = ("_elem", "_parent", "_wrappers", "__weakref__")
+
     def __init__(self, name: str | None = None):
         if not name:
             name = self._tag
         self._elem = etree.Element(name)
+        self._parent = None
+        self._wrappers = None
 
     def __hash__(self):
-        return hash(etree.tostring(self._elem))
+        return hash((self._elem.tag, tuple(sorted(_attrib(self._elem).items()))))
+
+    def __deepcopy__(self, memo):
+        """Copy the element, without the references to its parent and children."""
+        cls = type(self)
+        copied = cls.__new__(cls)
+        memo[id(self)] = copied
+        state, slots = self.__getstate__()
+        for name, value in slots.items():
+            setattr(copied, name, deepcopy(value, memo))
+        if state:
+            copied.__dict__.update(deepcopy(state, memo))
+        copied._parent = _unknown_parent
+        copied._wrappers = None
+        _reset(copied)
+        return copied
+
+    def __getstate__(self):
+        """The state to pickle, without the references to the parent and the
+        kept statistics and index.
+        """
+        slots = {}
+        for klass in type(self).__mro__:
+            for name in getattr(klass, "__slots__", ()):
+                if name not in _NOT_COPIED and hasattr(self, name):
+                    slots[name] = getattr(self, name)
+        return getattr(self, "__dict__", None), slots
+
+    def __setstate__(self, state):
+        state, slots = state
+        for name, value in slots.items():
+            setattr(self, name, value)
+        if state:
+            self.__dict__.update(state)
+        self._parent = _unknown_parent
+        self._wrappers = None
+        _reset(self)
 
     def __repr__(self):
         tag = self._elem.tag
-        keys = sorted(self._elem.attrib.keys())
+        keys = sorted(key for key in self._elem.attrib.keys() if key != _LAZY_TEXT)
         if keys:
             attrs_str = " ".join(
                 '%s="%s"' % (key, self._elem.attrib[key]) for key in keys
@@ -180,53 +749,92 @@ class Element(metaclass=junitxml):
         """Add the element subelement to the end of this elements internal
         list of subelements.
         """
-        self._elem.append(sub_elem._elem)
+        Element.extend(self, (sub_elem,))
 
     def extend(self, sub_elems):
         """Add elements subelement to the end of this elements internal
         list of subelements.
         """
+        sub_elems = list(sub_elems)
+        _moving(sub_elems)
+        last = _last_child(self._elem)
         self._elem.extend((sub_elem._elem for sub_elem in sub_elems))
+        parent = weakref.ref(self)
+        wrappers = _document(self)
+        for sub_elem in sub_elems:
+            sub_elem._parent = parent
+            _remember_wrapper(wrappers, sub_elem)
+        _children_changed(self, last, added=sub_elems)
 
     @classmethod
-    def fromstring(cls, text: str):
-        """Construct JUnit object *cls* from XML string *test*."""
+    def fromstring(cls, text: Union[str, bytes, memoryview], parser=None):
+        """Construct JUnit object *cls* from XML string *test*.
+
+        See :func:`get_parser` for the *parser*.
+        """
         instance = cls()
-        instance._elem = etree.fromstring(text)  # nosec
+        instance._elem = _fromstring(text, parser=parser)
         return instance
 
     @classmethod
     def fromelem(cls, elem):
-        """Construct JUnit objects from an ElementTree element *elem*."""
+        """Construct JUnit objects from an ElementTree element *elem*.
+
+        As long as it is in use, the same object is returned for the same
+        element and class, instead of a new object each time, like iterating
+        twice through the children of an object yields the same objects.
+        """
         if elem is None:
             return
-        instance = cls()
         if isinstance(elem, Element):
-            instance._elem = elem._elem
-        else:
-            instance._elem = elem
-        return instance
+            if type(elem) is cls:
+                return elem
+            return _wrap(cls, elem._elem, _document(elem))
+        ref = _passed.get(elem)
+        wrappers = ref() if ref is not None else None
+        if wrappers is None:
+            wrappers = _Wrappers()
+            _passed[elem] = weakref.KeyedRef(wrappers, _forget_wrappers, elem)
+        return _wrap(cls, elem, wrappers)
 
     def iterchildren(self, Child):
         """Iterate through specified *Child* type elements."""
         elems = self._elem.iterfind(Child._tag)
+        parent = weakref.ref(self)
+        wrappers = _document(self)
+        by_elem = _wrappers_of(wrappers, Child)
         for elem in elems:
-            yield Child.fromelem(elem)
+            ref = by_elem.get(elem)
+            child = ref() if ref is not None else None
+            if child is None:
+                child = _new_wrapper(Child, elem, wrappers)
+                by_elem.add(child)
+            child._parent = parent
+            yield child
 
     def child(self, Child):
         """Find a single child of specified *Child* type."""
         elem = self._elem.find(Child._tag)
-        return Child.fromelem(elem)
+        if elem is None:
+            return None
+        return _child(self, Child, elem)
 
     def remove(self, sub_elem):
         """Remove subelement *sub_elem*."""
+        last = _last_child(self._elem)
+        removed = []
         for elem in self._elem.iterfind(sub_elem._tag):
-            child = sub_elem.__class__.fromelem(elem)
+            child = _child(self, type(sub_elem), elem)
             if child == sub_elem:
                 self._elem.remove(child._elem)
+                child._parent = None
+                removed.append(child)
+        if removed:
+            _children_changed(self, last, removed=removed)
 
     def tostring(self):
         """Convert element to XML string."""
+        _load_texts(self._elem)
         return etree.tostring(self._elem, encoding="utf-8")
 
 
@@ -238,6 +846,8 @@ class Result(Element):
         type: Message type.
     """
 
+    __slots__ = ()
+
     _tag = None
     message = Attr()
     type = Attr()
@@ -258,22 +868,26 @@ class Result(Element):
 
     @property
     def text(self):
-        return self._elem.text
+        return _get_text(self._elem)
 
     @text.setter
     def text(self, value: str):
-        self._elem.text = value
+        _set_text(self._elem, value)
 
 
 class FinalResult(Result):
     """Base class for final test result (in contrast to XUnit2 InterimResult)."""
 
+    __slots__ = ()
+
     _tag = None
 
 
 class Skipped(FinalResult):
     """Test result when the case is skipped."""
 
+    __slots__ = ()
+
     _tag = "skipped"
 
     def __eq__(self, other):
@@ -283,6 +897,8 @@ class Skipped(FinalResult):
 class Failure(FinalResult):
     """Test result when the case failed."""
 
+    __slots__ = ()
+
     _tag = "failure"
 
     def __eq__(self, other):
@@ -292,6 +908,8 @@ class Failure(FinalResult):
 class Error(FinalResult):
     """Test result when the case has errors during execution."""
 
+    __slots__ = ()
+
     _tag = "error"
 
     def __eq__(self, other):
@@ -305,6 +923,8 @@ class System(Element):
         text: The output message.
     """
 
+    __slots__ = ()
+
     _tag = ""
 
     def __init__(self, content: str | None = None):
@@ -313,21 +933,49 @@ class System(Element):
 
     @property
     def text(self):
-        return self._elem.text
+        return _get_text(self._elem)
 
     @text.setter
     def text(self, value: str):
-        self._elem.text = value
+        _set_text(self._elem, value)
 
 
 class SystemOut(System):
+    __slots__ = ()
+
     _tag = "system-out"
 
 
 class SystemErr(System):
+    __slots__ = ()
+
     _tag = "system-err"
 
 
+class Status(str, Enum):
+    """Status of a testcase, see :attr:`TestCase.status`."""
+
+    PASSED = "passed"
+    SKIPPED = "skipped"
+    FAILURE = "failure"
+    ERROR = "error"
+
+
+# Bits of TestCase._results, for each kind of final result.
+_RESULT_BITS = {Skipped._tag: 1, Failure._tag: 2, Error._tag: 4}
+
+
+def _status(results: int) -> Status:
+    """The status for the kinds of final results *results*, see _RESULT_BITS."""
+    if results & 4:
+        return Status.ERROR
+    if results & 2:
+        return Status.FAILURE
+    if results & 1:
+        return Status.SKIPPED
+    return Status.PASSED
+
+
 class TestCase(Element):
     """Object to store a testcase and its result.
 
@@ -337,6 +985,10 @@ class TestCase(Element):
         time: The time consumed by the testcase.
     """
 
+    # The kinds of final results of the testcase, as _RESULT_BITS, and the
+    # key of the testcase, if known.
+    __slots__ = ("_results", "_key")
+
     _tag = "testcase"
     name = Attr()
     classname = Attr()
@@ -353,6 +1005,8 @@ class TestCase(Element):
         time: float | None = None,
     ):
         super().__init__(self._tag)
+        self._results = None
+        self._key = None
         if name is not None:
             self.name = name
         if classname is not None:
@@ -360,37 +1014,117 @@ class TestCase(Element):
         if time is not None:
             self.time = float(time)
 
+    # The attributes identifying a testcase, see :attr:`key`.
+    KEY_ATTRS = ("classname", "name", "file")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _watch_attrs(cls)
+
     def __hash__(self):
-        return super().__hash__()
+        return hash(self.key)
 
     def __iter__(self) -> Iterator[Union[Result, System]]:
         for elem in self._elem.iter():
             if elem.tag in self.ITER_TYPES:
-                yield self.ITER_TYPES[elem.tag].fromelem(elem)
+                yield _child(self, self.ITER_TYPES[elem.tag], elem)
 
     def __eq__(self, other):
-        # TODO: May not work correctly if unreliable hash method is used.
-        return hash(self) == hash(other)
+        """Whether both testcases have the same content, including their results
+        and outputs.
+
+        The elements are compared without serializing them, and only if the
+        keys of the testcases are equal.
+        """
+        if not isinstance(other, TestCase):
+            return NotImplemented
+        if self._elem is other._elem:
+            return True
+        return self.key == other.key and _elements_equal(self._elem, other._elem)
+
+    @property
+    def key(self) -> tuple:
+        """The values of the :attr:`KEY_ATTRS` attributes, identifying the testcase.
+
+        The key is cheap to compare and to hash, e.g. to find duplicates. It is
+        cached until an attribute is set through this object.
+        """
+        key = self._key
+        if key is None:
+            key = self._key = tuple(self._elem.get(name) for name in self.KEY_ATTRS)
+        return key
+
+    def _result_bits(self) -> int:
+        """The kinds of final results among the children, computed once."""
+        results = self._results
+        if results is None:
+            results = 0
+            for elem in self._elem:
+                results |= _RESULT_BITS.get(elem.tag, 0)
+            self._results = results
+        return results
+
+    @property
+    def status(self) -> Status:
+        """The status of this testcase, from its final results.
+
+        An error takes precedence over a failure, which takes precedence over
+        a skip. The status is computed in a single pass over the children and
+        cached until the results are changed through this object, e.g. with
+        :attr:`result` or :meth:`append`.
+        """
+        return _status(self._result_bits())
 
     @property
     def is_passed(self):
         """Whether this testcase was a success (i.e. if it isn't skipped, failed, or errored)."""
-        return not self.result
+        return not self._result_bits()
 
     @property
     def is_failure(self):
         """Whether this testcase failed."""
-        return any(isinstance(r, Failure) for r in self.result)
+        return bool(self._result_bits() & 2)
 
     @property
     def is_error(self):
         """Whether this testcase errored."""
-        return any(isinstance(r, Error) for r in self.result)
+        return bool(self._result_bits() & 4)
 
     @property
     def is_skipped(self):
         """Whether this testcase was skipped."""
-        return any(isinstance(r, Skipped) for r in self.result)
+        return bool(self._result_bits() & 1)
+
+    def append(self, sub_elem):
+        with self._changing_results():
+            super().append(sub_elem)
+
+    def extend(self, sub_elems):
+        with self._changing_results():
+            super().extend(sub_elems)
+
+    def remove(self, sub_elem):
+        with self._changing_results():
+            super().remove(sub_elem)
+
+    @contextmanager
+    def _changing_results(self):
+        """Reset the cached results, and update the statistics of the testsuite
+        this testcase was found in or added to by the change of its results or
+        time, or drop them if that testsuite isn't known anymore.
+        """
+        suite = _parent_of(self)
+        before = _case_statistics(self._elem) if isinstance(suite, TestSuite) else None
+        try:
+            yield
+        finally:
+            self._results = None
+            if before is not None:
+                delta = _case_statistics(self._elem)
+                _add_statistics(delta, before, -1)
+                _propagate(suite, delta)
+            elif not _is_detached(self):
+                _changed("_statistics")
 
     @property
     def result(self) -> List[FinalResult]:
@@ -407,21 +1141,23 @@ class TestCase(Element):
         ):
             raise ValueError("Value must be either FinalResult or list of FinalResult")
 
-        # First remove all existing results
-        for entry in self.result:
-            self.remove(entry)
-        if isinstance(value, FinalResult):
-            self.append(value)
-        else:
-            for entry in value:
-                self.append(entry)
+        with self._changing_results():
+            # First remove all existing results
+            for entry in self.result:
+                Element.remove(self, entry)
+            if isinstance(value, FinalResult):
+                Element.append(self, value)
+            else:
+                for entry in value:
+                    Element.append(self, entry)
 
     @property
     def system_out(self):
         """stdout."""
-        elem = self.child(SystemOut)
+        # Without wrapping the element, which adds up over many testcases.
+        elem = self._elem.find(SystemOut._tag)
         if elem is not None:
-            return elem.text
+            return _get_text(elem)
         return None
 
     @system_out.setter
@@ -436,9 +1172,9 @@ class TestCase(Element):
     @property
     def system_err(self):
         """stderr."""
-        elem = self.child(SystemErr)
+        elem = self._elem.find(SystemErr._tag)
         if elem is not None:
-            return elem.text
+            return _get_text(elem)
         return None
 
     @system_err.setter
@@ -451,6 +1187,46 @@ class TestCase(Element):
             self.append(err)
 
 
+class _TestCaseAttr(Attr):
+    """An :class:`Attr` of a testcase class, dropping what setting it may make
+    stale: the key of the testcase, the statistics of its testsuite for the
+    time, and the indexes for the classname and name.
+
+    The attribute *attr* is wrapped rather than changed, so that this is also
+    done for attributes whose class overrides ``__set__``.
+    """
+
+    def __init__(self, name: str, attr: Attr):
+        super().__init__(name)
+        self.attr = attr
+
+    def __get__(self, instance, cls):
+        return self.attr.__get__(instance, cls)
+
+    def __set__(self, instance, value):
+        instance._key = None
+        if self.name == "time":
+            with instance._changing_results():
+                self.attr.__set__(instance, value)
+            return
+        self.attr.__set__(instance, value)
+        if self.name in ("classname", "name") and not _is_detached(instance):
+            _changed("_index")
+
+
+def _watch_attrs(cls):
+    """Wrap the attributes declared by the testcase class *cls*, see
+    :class:`_TestCaseAttr`.
+    """
+    for key, value in list(vars(cls).items()):
+        if isinstance(value, Attr) and not isinstance(value, _TestCaseAttr):
+            value.name = key
+            setattr(cls, key, _TestCaseAttr(key, value))
+
+
+_watch_attrs(TestCase)
+
+
 class Property(Element):
     """A key/value pair that's stored in the testsuite or testcase properties.
 
@@ -461,6 +1237,8 @@ class Property(Element):
         value: The property value.
     """
 
+    __slots__ = ()
+
     _tag = "property"
     name = Attr()
     value = Attr()
@@ -487,6 +1265,8 @@ class Properties(Element):
     See :class:`Property`
     """
 
+    __slots__ = ()
+
     _tag = "properties"
 
     def __init__(self):
@@ -525,6 +1305,28 @@ class TestSuite(Element):
         skipped: Number of skipped cases.
     """
 
+    # The statistics of the testsuite as last counted or updated, the count
+    # of changes they are current with (see _changes), the number of children
+    # and the last child at that point, and the counted child testsuites,
+    # which are kept so that their statistics are too, see
+    # :meth:`update_statistics`. Then the index of the testcases, see
+    # :meth:`find`, the count of changes and the last child it is current with.
+    __slots__ = (
+        "filepath",
+        "root",
+        "_statistics",
+        "_counted_at",
+        "_count",
+        "_last",
+        "_suites",
+        "_index",
+        "_indexed_at",
+        "_index_last",
+    )
+
+    # The order in which the statistics attributes are written.
+    _statistics_order = ("tests", "errors", "failures", "skipped", "time")
+
     _tag = "testsuite"
     name = Attr()
     hostname = Attr()
@@ -543,6 +1345,7 @@ class TestSuite(Element):
         self.name = name
         self.filepath = None
         self.root = JUnitXml
+        _reset(self)
 
     def __iter__(self) -> Iterator[TestCase]:
         return itertools.chain(
@@ -601,33 +1404,144 @@ class TestSuite(Element):
         result.add_testsuite(other)
         return result
 
+    def __contains__(self, item):
+        """Whether the testcase or the (classname, name) *item* is in the
+        testsuite, looked up in the index, see :meth:`find`.
+        """
+        if isinstance(item, (TestCase, tuple)):
+            return _contains(self, item)
+        return any(case == item for case in self)
+
+    def find(self, classname: str | None, name: str | None, **attrs) -> "TestCase":
+        """Find the testcase named *name* of class *classname*, or ``None``.
+
+        If several testcases match, the first one found is returned. Further
+        attributes to match can be given as keyword arguments, e.g. ``file``
+        or, with :mod:`junitparser.xunit2`, ``group``.
+
+        Testcases are looked up in an index built on first use, which is kept
+        up to date by the changes made through the API, e.g. :meth:`add_testcase`
+        or merging testsuites into the report, and rebuilt when the testcases
+        may have been changed otherwise.
+        """
+        return _find(self, classname, name, attrs)
+
+    def _testcase_index(self) -> dict:
+        """The testcases of the testsuite by :func:`_index_key`, as lists of
+        (element, testsuite) entries in the order they are found.
+        """
+        if not _is_indexed(self):
+            index = {}
+            for elem in self._elem.iterfind(self.testcase._tag):
+                index.setdefault(_index_key(elem), []).append((elem, self))
+            for suite in super().iterchildren(type(self)):
+                suite._parent = weakref.ref(self)
+                for key, entries in suite._testcase_index().items():
+                    index.setdefault(key, []).extend(entries)
+            _keep_index(self, index)
+        return self._index
+
     def remove_testcase(self, testcase: TestCase):
         """Remove testcase *testcase* from the testsuite."""
-        for case in self:
+        last = _last_child(self._elem)
+        removed = []
+        for elem, suite in list(
+            self._testcase_index().get(_index_key(testcase._elem), ())
+        ):
+            if suite is not self:
+                continue
+            case = _child(self, self.testcase, elem)
             if case == testcase:
-                super().remove(case)
-                self.update_statistics()
+                self._elem.remove(elem)
+                case._parent = None
+                removed.append(case)
+        if removed:
+            _children_changed(self, last, removed=removed)
+            _update_statistics_if_changed(self)
+
+    def remove_testcases(self, predicate: Callable[[TestCase], bool]) -> int:
+        """Remove the testcases for which *predicate* returns true, including
+        those of nested testsuites, and return how many were removed.
+
+        Each testsuite is walked once, and its statistics are updated once.
+        """
+        removed = _remove_testcases(self, predicate)
+        if removed:
+            self._update_statistics()
+        return removed
+
+    def select(
+        self,
+        *,
+        status: Union[Status, str, None] = None,
+        classname: str | None = None,
+        name: str | None = None,
+        classname_glob: str | None = None,
+        name_glob: str | None = None,
+        min_time: float | None = None,
+        max_time: float | None = None,
+    ) -> List[TestCase]:
+        """The testcases matching all the given criteria, including those of
+        nested testsuites, in document order.
+
+        *status* is a :class:`Status` or its value, *classname_glob* and
+        *name_glob* are case-sensitive ``fnmatch`` patterns, and *min_time* and
+        *max_time* are inclusive bounds, which testcases without a time don't
+        match. For example::
+
+            suite.select(status="failure", classname_glob="pkg.*", min_time=5.0)
+
+        With lxml, the criteria are compiled once to an XPath query evaluated
+        by lxml itself, and only the matching testcases are wrapped in
+        :class:`TestCase` objects.
+        """
+        return _select(
+            self,
+            status=status,
+            classname=classname,
+            name=name,
+            classname_glob=classname_glob,
+            name_glob=name_glob,
+            min_time=min_time,
+            max_time=max_time,
+        )
 
     def update_statistics(self):
-        """Update test count and test time."""
-        tests = errors = failures = skipped = 0
-        time = 0
-        for case in self:
-            tests += 1
-            if case.time is not None:
-                time += case.time
-            for entry in case.result:
-                if isinstance(entry, Failure):
-                    failures += 1
-                elif isinstance(entry, Error):
-                    errors += 1
-                elif isinstance(entry, Skipped):
-                    skipped += 1
-        self.tests = tests
-        self.errors = errors
-        self.failures = failures
-        self.skipped = skipped
-        self.time = round(time, 3)
+        """Update test count and test time.
+
+        The testcases, including those of nested testsuites, are recounted.
+        The statistics are kept up to date by the methods of the testsuite and
+        its testcases, e.g. :meth:`add_testcase` or :attr:`TestCase.result`,
+        so this is only needed after changing them otherwise, e.g. through the
+        underlying XML elements.
+        """
+        self._update_statistics(recount=True)
+
+    def _update_statistics(self, recount: bool = False):
+        """Update the statistics, only recounting them if they may be stale,
+        unless *recount* is true.
+        """
+        _set_statistics(self, self._counted(recount))
+
+    def _counted(self, recount: bool = False) -> "Statistics":
+        """The statistics of the testsuite, recounted if they may be stale or
+        if *recount* is true.
+
+        Only the children of the testsuite are checked for changes, so changes
+        to the elements below them are only noticed when recounting.
+        """
+        if recount or not _is_counted(self):
+            statistics = Statistics()
+            for elem in self._elem.iterfind(self.testcase._tag):
+                _add_statistics(statistics, _case_statistics(elem))
+            suites = list(super().iterchildren(type(self)))
+            parent = weakref.ref(self)
+            for suite in suites:
+                suite._parent = parent
+                _add_statistics(statistics, suite._counted(recount))
+            _keep_counted(self, statistics)
+            self._suites = suites
+        return self._statistics
 
     def add_property(self, name: str, value: str):
         """Add a property *name* = *value* to the testsuite.
@@ -645,12 +1559,12 @@ class TestSuite(Element):
     def add_testcase(self, testcase: TestCase):
         """Add a testcase *testcase* to the testsuite."""
         self.append(testcase)
-        self.update_statistics()
+        _update_statistics_if_changed(self)
 
     def add_testcases(self, testcases: List[TestCase]):
         """Add testcases *testcases* to the testsuite."""
         self.extend(testcases)
-        self.update_statistics()
+        _update_statistics_if_changed(self)
 
     def _add_testcase_no_update_stats(self, testcase: TestCase):
         """Add *testcase* to the testsuite (without updating statistics).
@@ -659,6 +1573,26 @@ class TestSuite(Element):
         """
         self.append(testcase)
 
+    @classmethod
+    def from_records(cls, records, name: str | None = None) -> "TestSuite":
+        """Build a testsuite named *name* from the testcases *records*.
+
+        Each record is a dict or a tuple with the fields (in this order)
+        ``name``, ``classname``, ``time``, ``status``, ``message``, ``text``
+        and ``stdout``, which can be left out or ``None``. The ``status`` is a
+        :class:`Status` or its value, and a record that isn't passed gets a
+        result with the ``message`` and ``text``.
+
+        The elements are built directly, without a :class:`TestCase` object
+        per record, and the statistics are counted while building them.
+        """
+        suite = cls(name)
+        statistics = Statistics()
+        for record in records:
+            _append_record(suite._elem, _record_fields(record), statistics)
+        _set_counted(suite, statistics)
+        return suite
+
     def add_testsuite(self, suite):
         """Add a testsuite *suite* to the testsuite."""
         self.append(suite)
@@ -704,6 +1638,21 @@ class JUnitXml(Element):
         skipped: Number of skipped cases.
     """
 
+    # See TestSuite.
+    __slots__ = (
+        "filepath",
+        "_statistics",
+        "_counted_at",
+        "_count",
+        "_last",
+        "_suites",
+        "_index",
+        "_indexed_at",
+        "_index_last",
+    )
+
+    _statistics_order = ("tests", "failures", "errors", "skipped", "time")
+
     _tag = "testsuites"
     name = Attr()
     time = FloatAttr()
@@ -718,6 +1667,7 @@ class JUnitXml(Element):
         super().__init__(self._tag)
         self.filepath = None
         self.name = name
+        _reset(self)
 
     def __iter__(self) -> Iterator[TestSuite]:
         return super().iterchildren(self.testsuite)
@@ -756,21 +1706,24 @@ class JUnitXml(Element):
         self.append(suite)
 
     def update_statistics(self):
-        """Update test count, time, etc."""
-        time = 0
-        tests = failures = errors = skipped = 0
-        for suite in self:
-            suite.update_statistics()
-            tests += suite.tests
-            failures += suite.failures
-            errors += suite.errors
-            skipped += suite.skipped
-            time += suite.time
-        self.tests = tests
-        self.failures = failures
-        self.errors = errors
-        self.skipped = skipped
-        self.time = round(time, 3)
+        """Update test count, time, etc.
+
+        The testcases of all the testsuites are recounted, see
+        :meth:`TestSuite.update_statistics`.
+        """
+        self._update_statistics(recount=True)
+
+    def _update_statistics(self, recount: bool = False):
+        """Update the statistics, only recounting the testsuites whose
+        statistics may be stale, unless *recount* is true.
+        """
+        statistics = Statistics()
+        suites = list(self)
+        for suite in suites:
+            suite._update_statistics(recount)
+            _add_statistics(statistics, suite._statistics)
+        self._suites = suites
+        _set_counted(self, statistics)
 
     @classmethod
     def fromroot(cls, root_elem: Element) -> "JUnitXml":
@@ -785,14 +1738,135 @@ class JUnitXml(Element):
         instance._elem = root_elem
         return instance
 
+    def __contains__(self, item):
+        """Whether the testcase or the (classname, name) *item* is in the
+        report, or the testsuite *item* is one of its testsuites.
+        """
+        if isinstance(item, (TestCase, tuple)):
+            return _contains(self, item)
+        return any(suite == item for suite in self)
+
+    def find(self, classname: str | None, name: str | None, **attrs) -> "TestCase":
+        """Find the testcase named *name* of class *classname* in the
+        testsuites, or ``None``, see :meth:`TestSuite.find`.
+        """
+        return _find(self, classname, name, attrs)
+
+    def remove_testcases(self, predicate: Callable[[TestCase], bool]) -> int:
+        """Remove the testcases for which *predicate* returns true from all the
+        testsuites, and return how many were removed.
+
+        See :meth:`TestSuite.remove_testcases`.
+        """
+        removed = 0
+        for suite in self:
+            removed += _remove_testcases(suite, predicate)
+        if removed:
+            self._update_statistics()
+        return removed
+
+    def select(
+        self,
+        *,
+        status: Union[Status, str, None] = None,
+        classname: str | None = None,
+        name: str | None = None,
+        classname_glob: str | None = None,
+        name_glob: str | None = None,
+        min_time: float | None = None,
+        max_time: float | None = None,
+    ) -> List[TestCase]:
+        """The testcases of the testsuites matching all the given criteria, see
+        :meth:`TestSuite.select`.
+        """
+        return _select(
+            self,
+            status=status,
+            classname=classname,
+            name=name,
+            classname_glob=classname_glob,
+            name_glob=name_glob,
+            min_time=min_time,
+            max_time=max_time,
+        )
+
+    def _testcase_index(self) -> dict:
+        """The testcases of the testsuites, see :meth:`TestSuite._testcase_index`."""
+        if not _is_indexed(self):
+            index = {}
+            for suite in self:
+                for key, entries in suite._testcase_index().items():
+                    index.setdefault(key, []).extend(entries)
+            _keep_index(self, index)
+        return self._index
+
+    def to_columns(self) -> "Columns":
+        """The testcases of the report as :class:`Columns`, extracted in a
+        single pass over the elements, without creating objects for them.
+        """
+        return _to_columns(self._elem)
+
+    def snapshot(self) -> "Snapshot":
+        """The report as immutable records, detached from the XML tree.
+
+        The :class:`Snapshot` holds a :class:`SuiteRecord` for each testsuite
+        and a :class:`CaseRecord` for each testcase, which take much less
+        memory than the tree and are cheap to pickle, e.g. to keep reports for
+        read-only analysis or to send them to other processes. Their fields
+        are named after the attributes of :class:`TestSuite` and
+        :class:`TestCase`. The texts of the elements are not kept.
+
+        See :func:`read_snapshot` to read the snapshot of a file directly.
+        """
+        return _snapshot(self._elem)
+
+    @classmethod
+    def from_records(cls, records, name: str | None = None) -> "JUnitXml":
+        """Build a report named *name* from the testcases *records*.
+
+        The records are those of :meth:`TestSuite.from_records`, with an
+        additional ``testsuite`` field, the name of the testsuite of the
+        testcase. The testsuites are created in the order they first appear.
+        """
+        instance = cls(name)
+        suites = {}
+        for record in records:
+            fields = _record_fields(record)
+            suite_name = fields[-1]
+            if suite_name not in suites:
+                suite = cls.testsuite(suite_name)
+                instance.append(suite)
+                suites[suite_name] = (suite, Statistics())
+            suite, statistics = suites[suite_name]
+            _append_record(suite._elem, fields, statistics)
+        for suite, statistics in suites.values():
+            _set_counted(suite, statistics)
+        instance._update_statistics()
+        return instance
+
     @classmethod
-    def fromstring(cls, text: Union[str, bytes]) -> "JUnitXml":
-        """Construct JUnit objects from an XML string (str or bytes)."""
-        root_elem = etree.fromstring(text)  # nosec
+    def fromstring(cls, text: Union[str, bytes, memoryview], parser=None) -> "JUnitXml":
+        """Construct JUnit objects from an XML string.
+
+        Besides str and bytes, *text* can be any object supporting the buffer
+        protocol, like a ``memoryview``, a ``bytearray`` or an ``mmap.mmap`` of a
+        report file. Buffers are fed to the parser in chunks of 64 KiB, so
+        only a chunk at a time is copied, not the whole buffer.
+
+        See :func:`get_parser` for the *parser*.
+        """
+        root_elem = _fromstring(text, parser=parser)
         return cls.fromroot(root_elem)
 
     @classmethod
-    def fromfile(cls, file: Union[str, IO], parse_func=None) -> "JUnitXml":
+    def fromfile(
+        cls,
+        file: Union[str, IO],
+        parse_func=None,
+        case_filter: Optional[Callable[["TestCase"], bool]] = None,
+        lazy_text: bool = False,
+        parser=None,
+    ) -> "JUnitXml":
         """
         Construct JUnit objects from an XML file.
 
@@ -802,14 +1876,255 @@ class JUnitXml(Element):
         - a file object
         - a file-like object
         - a URL using the HTTP or FTP protocol (with lxml only)
+
+        Files and file objects compressed with gzip, bzip2 or xz are decompressed
+        on the fly. As writing them back would lose the compression, the
+        ``filepath`` of the returned object is not set for compressed files.
+
+        Reports can be read from zip and tar archives without extracting them,
+        with a path like ``artifacts.zip!reports/TEST-foo.xml``. The member name
+        can be a glob like ``artifacts.tar.gz!**/TEST-*.xml``, in which case
+        the matching reports are merged.
+
+        To load only some of the testcases, pass a *case_filter* function,
+        e.g. ``lambda case: case.is_failure or case.is_error``. It is called
+        with each testcase as soon as it is read, and the testcases for which
+        it returns false are discarded right away, along with their output.
+        The statistics attributes of the testsuites and of the root are set to
+        count all the testcases read, as :meth:`update_statistics` would have
+        before the testcases were discarded. A *case_filter* can't be combined
+        with a *parse_func*.
+
+        With *lazy_text*, the text of the results and of the system outputs,
+        which usually makes most of a report, is not loaded. Only its position
+        in the file is kept, and it is read from the file each time it is
+        accessed, e.g. through :attr:`TestCase.system_out`. Writing the report
+        loads the texts. The file must be a local uncompressed file, which must
+        not change as long as the texts are accessed. The comments and
+        processing instructions of the file are not kept.
+
+        The *parser* configures the XML parser, e.g.
+        ``parser=get_parser(huge_tree=True)`` for reports with huge outputs.
+        See :func:`get_parser`. It can be combined with a *case_filter*, whose
+        incremental parser gets the same options. The parser of *lazy_text*
+        has no size limits, but can't remove blank text nor resolve entities.
+
+        A *parse_func* can't be combined with any other option, nor
+        *case_filter* with *lazy_text*.
         """
-        if parse_func is not None:
-            tree = parse_func(file)
-        else:
-            tree = etree.parse(file)  # nosec
-        root_elem = tree.getroot()
+        others = (case_filter, lazy_text or None, parser)
+        if parse_func is not None and any(option is not None for option in others):
+            raise ValueError("parse_func cannot be combined with other options.")
+        if case_filter is not None and lazy_text:
+            raise ValueError("case_filter and lazy_text cannot be combined.")
+        if lazy_text:
+            options = {} if parser is None else _get_parser_options(parser)
+            if options.get("remove_blank_text") or options.get("resolve_entities"):
+                raise ValueError(
+                    "lazy_text can't remove blank text nor resolve entities."
+                )
+            root_elem = _LazyTextBuilder(file, _text_tags()).parse()
+            instance = cls.fromroot(root_elem)
+            instance.filepath = file if isinstance(file, str) else None
+            return instance
+
+        archive = _split_archive_path(file)
+        if archive is not None:
+            instance = None
+            for source in _iter_archive(*archive):
+                xml = cls.fromfile(source, parse_func, case_filter, parser=parser)
+                if instance is None:
+                    instance = xml
+                else:
+                    instance += xml
+            return instance
+
+        statistics = None
+        with _decompressed(file) as source:
+            if case_filter is not None:
+                with _open_source(source) as stream:
+                    root_elem, statistics = cls._parse_filtered(
+                        stream, case_filter, parser
+                    )
+            else:
+                if parse_func is not None:
+                    tree = parse_func(source)
+                else:
+                    tree = etree.parse(source, parser)  # nosec
+                root_elem = tree.getroot()
         instance = cls.fromroot(root_elem)
+        if statistics is not None:
+            _set_statistics(instance, statistics)
+        instance.filepath = file if isinstance(file, str) and source is file else None
+        return instance
+
+    @classmethod
+    def _parse_filtered(
+        cls, source: IO, case_filter, parser=None
+    ) -> Tuple[Element, "Statistics"]:
+        """Parse *source*, discarding the testcases rejected by *case_filter*.
+
+        Returns the root element and the statistics of all the testcases, which
+        are also set on the testsuites.
+        """
+        suite_cls = cls.testsuite
+        case_cls = suite_cls.testcase
+        parents = []
+        suites = []
+        counts = []
+        total = Statistics()
+        for event, elem in _iterparse(source, parser=parser):
+            if event == "start":
+                if not parents and elem.tag not in ("testsuites", "testsuite"):
+                    raise JUnitXmlError("Invalid format.")
+                if elem.tag == suite_cls._tag:
+                    suites.append(elem)
+                    counts.append(Statistics())
+                parents.append(elem)
+                continue
+
+            root_elem = parents.pop()
+            if not parents:
+                break
+            parent = parents[-1]
+            if elem.tag == case_cls._tag and suites and parent is suites[-1]:
+                case = _new_wrapper(case_cls, elem)
+                counts[-1].count(case)
+                if not case_filter(case):
+                    parent.remove(elem)
+            elif elem.tag == suite_cls._tag:
+                suites.pop()
+                statistics = counts.pop()
+                _set_statistics(_new_wrapper(suite_cls, elem), statistics)
+                if counts:
+                    counts[-1] += statistics
+                else:
+                    total += statistics
+        if counts:
+            # The root itself is a testsuite.
+            _set_statistics(_new_wrapper(suite_cls, root_elem), counts[-1])
+            total = counts[-1]
+        return root_elem, total
+
+    @classmethod
+    def iterfile(
+        cls, file: Union[str, IO], parser=None
+    ) -> Iterator[Tuple["TestSuite", "TestCase"]]:
+        """
+        Iterate through the testcases of an XML file without loading it at once.
+
+        Yields ``(suite, case)`` tuples, where *suite* is the innermost
+        ``<testsuite>`` containing *case*. The file is parsed incrementally, and
+        each testcase is detached from the tree as soon as it is read, so memory
+        use does not grow with the size of the file. For the same reason *suite*
+        only holds its attributes and the children that are not testcases, like
+        its properties. See :class:`JUnitXmlPullParser` to parse reports fed in
+        chunks instead.
+
+        The ``file`` can be a file name/path, a file object or a file-like object.
+        The file is read with the options of *parser*, e.g.
+        ``parser=get_parser(huge_tree=True)``, see :func:`get_parser`.
+        """
+        for source in _iter_sources(file):
+            pull_parser = JUnitXmlPullParser(cls, parser)
+            suites = []
+            for event, obj in pull_parser._parse(source):
+                if event == "start":
+                    suites.append(obj)
+                elif event == "end":
+                    suites.pop()
+                else:
+                    yield suites[-1], obj
+
+    @classmethod
+    def itersuites(cls, file: Union[str, IO], parser=None) -> Iterator["TestSuite"]:
+        """
+        Iterate through the top-level testsuites of an XML file one at a time.
+
+        Like :meth:`iterfile`, the file is parsed incrementally. Each testsuite is
+        complete, including its testcases and nested testsuites, and is detached
+        from the tree as soon as the next one is requested, so only a single
+        testsuite is held in memory at any time.
+
+        The ``file`` can be a file name/path, a file object or a file-like object.
+        The file is read with the options of *parser*, like :meth:`iterfile`.
+        """
+        suite_cls = cls.testsuite
+        for source in _iter_sources(file):
+            root = None
+            depth = 0
+            for event, elem in _iterparse(source, parser=parser):
+                if event == "start":
+                    if root is None:
+                        if elem.tag not in ("testsuites", "testsuite"):
+                            raise JUnitXmlError("Invalid format.")
+                        root = elem
+                    depth += 1
+                    continue
+
+                depth -= 1
+                if elem.tag != suite_cls._tag:
+                    continue
+                if depth == 0:
+                    # The root itself is the only testsuite.
+                    yield _new_wrapper(suite_cls, elem)
+                elif depth == 1 and root.tag == "testsuites":
+                    yield _new_wrapper(suite_cls, elem)
+                    root.remove(elem)
+
+    @classmethod
+    def fromheader(cls, file: Union[str, IO], fallback: bool = False) -> "JUnitXml":
+        """
+        Construct JUnit objects from the statistics declared in an XML file.
+
+        Only the start tags of the root and of the top-level testsuites are read,
+        and their ``tests``, ``failures``, ``errors``, ``skipped`` and ``time``
+        attributes are taken on trust. The testsuites have no testcases. If the
+        root declares all of these attributes, parsing stops right after its
+        start tag, no testsuites are read at all, and reading takes the same
+        time regardless of the file size.
+
+        Attributes missing from the root are summed up from the testsuites if
+        they all declare them. With *fallback*, the statistics declared nowhere
+        are counted like :meth:`update_statistics` would, as the file has to be
+        read completely anyway. Otherwise they are left out.
+
+        The ``file`` can be a file name/path, a file object or a file-like object.
+        """
+        suite_cls = cls.testsuite
+        root_keys = _statistics_attrs(cls)
+        suite_keys = _statistics_attrs(suite_cls)
+
+        def declares_statistics(tag, attrib):
+            keys = root_keys if tag == cls._tag else suite_keys
+            return all(key in attrib for key in keys)
+
+        counter = _StatisticsCounter(stop_at_root=declares_statistics)
+        with _open_source(file) as source:
+            read_completely = counter.parse(source)
+
+        instance = cls()
         instance.filepath = file if isinstance(file, str) else None
+        if counter.root_tag == cls._tag:
+            instance._elem.attrib.update(counter.root_attrib)
+        suites = []
+        for attrib in counter.suite_attribs:
+            elem = etree.SubElement(instance._elem, suite_cls._tag, attrib)
+            suites.append(_child(instance, suite_cls, elem))
+
+        if fallback and read_completely:
+            for suite, statistics in zip(suites, counter.statistics):
+                for key in suite_keys:
+                    if suite._elem.get(key) is None:
+                        setattr(suite, key, getattr(statistics, key))
+        for key in root_keys:
+            if instance._elem.get(key) is not None:
+                continue
+            if any(suite._elem.get(key) is None for suite in suites):
+                continue
+            if suites or fallback:
+                total = sum(getattr(suite, key) for suite in suites)
+                setattr(instance, key, round(total, 3) if key == "time" else total)
         return instance
 
     def write(
@@ -821,3 +2136,1401 @@ class JUnitXml(Element):
         If `pretty` is True, the result file will be more human friendly.
         """
         write_xml(self, file_or_filename=file_or_filename, pretty=pretty)
+
+
+class Statistics:
+    """Test counts and time of a report, as computed by ``update_statistics``.
+
+    Attributes:
+        tests: Total number of tests.
+        failures: Number of failed tests.
+        errors: Number of cases with errors.
+        skipped: Number of skipped cases.
+        time: Time consumed by the tests, rounded to milliseconds like the
+            ``time`` written by ``update_statistics``. The times are summed
+            unrounded, and only the sum is rounded.
+    """
+
+    def __init__(
+        self,
+        tests: int = 0,
+        failures: int = 0,
+        errors: int = 0,
+        skipped: int = 0,
+        time: float = 0,
+    ):
+        self.tests = tests
+        self.failures = failures
+        self.errors = errors
+        self.skipped = skipped
+        self._time = time
+
+    @property
+    def time(self) -> float:
+        return round(self._time, 3)
+
+    @time.setter
+    def time(self, value: float):
+        self._time = value
+
+    def __repr__(self):
+        return "<Statistics tests=%d failures=%d errors=%d skipped=%d time=%s>" % (
+            self.tests,
+            self.failures,
+            self.errors,
+            self.skipped,
+            self.time,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, Statistics):
+            return NotImplemented
+        return self.todict() == other.todict()
+
+    def __add__(self, other):
+        return Statistics(
+            self.tests + other.tests,
+            self.failures + other.failures,
+            self.errors + other.errors,
+            self.skipped + other.skipped,
+            self._time + other._time,
+        )
+
+    def count(self, case: "TestCase"):
+        """Add the testcase *case* to the statistics, like ``update_statistics``."""
+        self.tests += 1
+        if case.time is not None:
+            self._time += case.time
+        for entry in case.result:
+            if isinstance(entry, Failure):
+                self.failures += 1
+            elif isinstance(entry, Error):
+                self.errors += 1
+            elif isinstance(entry, Skipped):
+                self.skipped += 1
+
+    def todict(self) -> dict:
+        """Convert the statistics to a dict, e.g. to serialize them as JSON."""
+        return {
+            "tests": self.tests,
+            "failures": self.failures,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "time": self.time,
+        }
+
+
+class Columns:
+    """The testcases of a report as columns, see :meth:`JUnitXml.to_columns`.
+
+    Row *i* of every column describes the *i*-th testcase, in document order.
+
+    Attributes:
+        suite: Names of the testsuites directly containing the testcases.
+        classname: Classnames of the testcases.
+        name: Names of the testcases.
+        time: Times of the testcases, as an ``array('d')``, NaN if unknown.
+        status: Indexes of the statuses of the testcases in :attr:`STATUSES`,
+            as an ``array('B')``.
+        messages: The messages of the results that determine the statuses,
+            concatenated.
+        message_offsets: Where the message of each testcase starts in
+            :attr:`messages`, and where the last one ends, as an ``array('q')``.
+    """
+
+    # The statuses by their codes in :attr:`status`.
+    STATUSES = (Status.PASSED, Status.SKIPPED, Status.FAILURE, Status.ERROR)
+
+    def __init__(self):
+        self.suite = []
+        self.classname = []
+        self.name = []
+        self.time = array("d")
+        self.status = array("B")
+        self.messages = ""
+        self.message_offsets = array("q", [0])
+
+    def __len__(self):
+        return len(self.name)
+
+    def __repr__(self):
+        return "<Columns testcases=%d>" % len(self)
+
+    def message(self, index: int) -> str:
+        """The message of the *index*-th testcase, empty if it has none."""
+        offsets = self.message_offsets
+        return self.messages[offsets[index] : offsets[index + 1]]
+
+    def to_numpy(self) -> dict:
+        """Convert the columns to a dict of NumPy arrays, which requires NumPy.
+
+        The ``time``, ``status`` and ``message_offsets`` arrays share the
+        memory of the columns instead of copying it.
+        """
+        import numpy
+
+        return {
+            "suite": numpy.array(self.suite, dtype=object),
+            "classname": numpy.array(self.classname, dtype=object),
+            "name": numpy.array(self.name, dtype=object),
+            "time": numpy.frombuffer(self.time, dtype=numpy.float64),
+            "status": numpy.frombuffer(self.status, dtype=numpy.uint8),
+            "messages": self.messages,
+            "message_offsets": numpy.frombuffer(
+                self.message_offsets, dtype=numpy.int64
+            ),
+        }
+
+
+# The codes of Columns.status, indexed by TestCase._results bits.
+_STATUS_CODES = bytes(Columns.STATUSES.index(_status(bits)) for bits in range(8))
+
+# The precedence of the results for the message of Columns, by tag.
+_MESSAGE_PRECEDENCE = {Skipped._tag: 1, Failure._tag: 2, Error._tag: 3}
+
+# The kinds of final results, the precedence and the message of a testcase
+# without final results, see _add_final_result.
+_NO_FINAL_RESULTS = (0, 0, None)
+
+
+def _add_final_result(found: tuple, tag: str, attrib) -> tuple:
+    """Add the final result *tag* with the attributes *attrib*, a mapping or an
+    element, to *found*, the kinds of final results as _RESULT_BITS, the
+    precedence and the message of the final results of a testcase so far.
+    """
+    results, precedence, message = found
+    results |= _RESULT_BITS[tag]
+    if _MESSAGE_PRECEDENCE[tag] > precedence:
+        precedence = _MESSAGE_PRECEDENCE[tag]
+        message = attrib.get("message")
+    return results, precedence, message
+
+
+def _final_results(case_elem) -> Tuple[int, Optional[str]]:
+    """The kinds of final results of the testcase element *case_elem*, as
+    _RESULT_BITS, and the message of the one with the highest precedence.
+    """
+    found = _NO_FINAL_RESULTS
+    for elem in case_elem:
+        if elem.tag in _MESSAGE_PRECEDENCE:
+            found = _add_final_result(found, elem.tag, elem)
+    return found[0], found[2]
+
+
+def _to_columns(root_elem) -> Columns:
+    """Extract the :class:`Columns` of the testcases below *root_elem*."""
+    columns = Columns()
+    suite_names = columns.suite
+    classnames = columns.classname
+    names = columns.name
+    times = columns.time
+    statuses = columns.status
+    offsets = columns.message_offsets
+    messages = []
+    length = 0
+    nan = float("nan")
+    for suite_elem in root_elem.iter(TestSuite._tag):
+        suite_name = suite_elem.get("name")
+        for case_elem in suite_elem.iterfind(TestCase._tag):
+            suite_names.append(suite_name)
+            classnames.append(case_elem.get("classname"))
+            names.append(case_elem.get("name"))
+            value = case_elem.get("time")
+            if not value:
+                times.append(nan)
+            else:
+                try:
+                    times.append(float(value))
+                except ValueError:
+                    times.append(float(value.replace(",", "")))
+            bits, message = _final_results(case_elem)
+            statuses.append(_STATUS_CODES[bits])
+            if message:
+                messages.append(message)
+                length += len(message)
+            offsets.append(length)
+    columns.messages = "".join(messages)
+    return columns
+
+
+class CaseRecord(NamedTuple):
+    """A testcase detached from the XML tree, see :meth:`JUnitXml.snapshot`.
+
+    Attributes:
+        name: Name of the testcase.
+        classname: The parent class of the testcase.
+        time: The time consumed by the testcase.
+        status: The :class:`Status` of the testcase.
+        message: The message of the final result giving the status, if any.
+    """
+
+    name: Optional[str]
+    classname: Optional[str]
+    time: Optional[float]
+    status: Status
+    message: Optional[str]
+
+
+class SuiteRecord(NamedTuple):
+    """A testsuite detached from the XML tree, see :meth:`JUnitXml.snapshot`.
+
+    The statistics are the ones declared by the testsuite, ``None`` if not.
+
+    Attributes:
+        name: The name of the testsuite.
+        hostname: Name of the test machine.
+        time: Time consumed by the testsuite.
+        timestamp: When the test was run.
+        tests: Total number of tests.
+        failures: Number of failed tests.
+        errors: Number of cases with errors.
+        skipped: Number of skipped cases.
+        testcases: The :class:`CaseRecord` of each testcase of the testsuite,
+            not including those of nested testsuites.
+    """
+
+    name: Optional[str]
+    hostname: Optional[str]
+    time: Optional[float]
+    timestamp: Optional[str]
+    tests: Optional[int]
+    failures: Optional[int]
+    errors: Optional[int]
+    skipped: Optional[int]
+    testcases: Tuple[CaseRecord, ...]
+
+
+class Snapshot(NamedTuple):
+    """A report detached from the XML tree, see :meth:`JUnitXml.snapshot`.
+
+    The statistics are the ones declared by the root, ``None`` if not.
+
+    Attributes:
+        name: Name of the report.
+        time: Time consumed by the testsuites.
+        tests: Total number of tests.
+        failures: Number of failed cases.
+        errors: Number of cases with errors.
+        skipped: Number of skipped cases.
+        testsuites: The :class:`SuiteRecord` of each testsuite, nested
+            testsuites included, in document order.
+    """
+
+    name: Optional[str]
+    time: Optional[float]
+    tests: Optional[int]
+    failures: Optional[int]
+    errors: Optional[int]
+    skipped: Optional[int]
+    testsuites: Tuple[SuiteRecord, ...]
+
+
+def _snapshot(root_elem) -> Snapshot:
+    """Snapshot the testsuites and testcases below *root_elem*."""
+    builder = _SnapshotBuilder()
+    builder.roots.append(root_elem.attrib)
+    for suite_elem in root_elem.iter(TestSuite._tag):
+        index = builder.open_suite()
+        cases = []
+        for case_elem in suite_elem.iterfind(TestCase._tag):
+            results, message = _final_results(case_elem)
+            cases.append(builder.case(case_elem.attrib, results, message))
+        builder.close_suite(index, suite_elem.attrib, cases)
+    return builder.snapshot()
+
+
+class JUnitXmlPullParser:
+    """Parse an XML report fed in chunks, e.g. as it is received over the network.
+
+    Testsuites and testcases are emitted as soon as they are read, so a report
+    can be processed while it arrives, and memory use does not grow with its
+    size::
+
+        parser = JUnitXmlPullParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event, obj in parser.read_events():
+                ...
+        parser.close()
+
+    :meth:`read_events` yields ``(event, obj)`` tuples:
+
+    * ``("start", suite)`` when a ``<testsuite>`` starts. The suite only has
+      its attributes.
+    * ``("testcase", case)`` when a ``<testcase>`` of a testsuite is complete.
+      It is detached from its suite, which thus never holds testcases.
+    * ``("end", suite)`` when a ``<testsuite>`` is complete, with its other
+      children like its properties.
+
+    :attr:`statistics` counts the testcases emitted so far, like
+    :meth:`TestSuite.update_statistics` would, and :attr:`complete` tells
+    whether the root element has been read completely.
+
+    The *xml_class* can be a subclass of :class:`JUnitXml`, like the one of
+    :mod:`junitparser.xunit2`, to emit its testsuite and testcase classes. The
+    report is read with the options of *parser*, e.g. ``get_parser(huge_tree=True)``
+    for huge outputs, see :func:`get_parser`.
+    """
+
+    def __init__(self, xml_class=None, parser=None):
+        suite_cls = (xml_class or JUnitXml).testsuite
+        self._suite_cls = suite_cls
+        self._case_cls = suite_cls.testcase
+        self._parser = _pull_parser(parser)
+        self._parents = []
+        self._suites = []
+        self.statistics = Statistics()
+        self.complete = False
+
+    def feed(self, data: Union[str, bytes]):
+        """Feed a chunk of the report to the parser."""
+        self._parser.feed(data)
+
+    def close(self):
+        """Signal the end of the report, raising an error if it is incomplete.
+
+        Call :meth:`read_events` afterwards to get the remaining events.
+        """
+        self._parser.close()
+
+    def read_events(self) -> Iterator[Tuple[str, Union["TestSuite", "TestCase"]]]:
+        """Yield the events of the data fed so far."""
+        parents = self._parents
+        suites = self._suites
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if not parents and elem.tag not in ("testsuites", "testsuite"):
+                    raise JUnitXmlError("Invalid format.")
+                parents.append(elem)
+                if elem.tag == self._suite_cls._tag:
+                    suites.append(_new_wrapper(self._suite_cls, elem))
+                    yield "start", suites[-1]
+                continue
+
+            parents.pop()
+            parent = parents[-1] if parents else None
+            if parent is None:
+                self.complete = True
+            if (
+                elem.tag == self._case_cls._tag
+                and suites
+                and parent is suites[-1]._elem
+            ):
+                case = _new_wrapper(self._case_cls, elem)
+                parent.remove(elem)
+                self.statistics.count(case)
+                yield "testcase", case
+            elif elem.tag == self._suite_cls._tag:
+                suite = suites.pop()
+                if parent is not None:
+                    parent.remove(elem)
+                yield "end", suite
+
+    def follow(
+        self,
+        file: Union[str, os.PathLike],
+        interval: float = 1.0,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Tuple[str, Union["TestSuite", "TestCase"]]]:
+        """Yield the events of a report that is still being written, as it grows.
+
+        The file *file* is polled every *interval* seconds for new data, which
+        is fed to the parser, so nothing is read twice. Following stops once the
+        root element is complete. It also stops, leaving the parser open, after
+        *timeout* seconds without new data, unless *timeout* is ``None``. The
+        file doesn't need to exist yet.
+        """
+        with closing(_tail(file, interval, timeout)) as chunks:
+            for chunk in chunks:
+                self.feed(chunk)
+                yield from self.read_events()
+                if self.complete:
+                    break
+            else:
+                return
+        self.close()
+        yield from self.read_events()
+
+    def _parse(self, source, chunk_size: int = 64 * 1024):
+        """Yield the events of a whole file-like *source*."""
+        while True:
+            data = source.read(chunk_size)
+            if not data:
+                break
+            self.feed(data)
+            yield from self.read_events()
+        self.close()
+        yield from self.read_events()
+
+
+def read_statistics(file: Union[str, IO]) -> Statistics:
+    """Count the tests of an XML file without building a tree.
+
+    The numbers are the same as :meth:`JUnitXml.update_statistics` would compute,
+    so they don't rely on the attributes declared in the file. The file is fed
+    to expat in chunks and no elements are created, which makes this much
+    cheaper than parsing the file with :meth:`JUnitXml.fromfile`.
+
+    The ``file`` can be a file name/path, a file object or a file-like object.
+    """
+    total = Statistics()
+    for source in _iter_sources(file):
+        counter = _StatisticsCounter()
+        counter.parse(source)
+        for suite in counter.statistics:
+            total += suite
+    return total
+
+
+def read_snapshot(file: Union[str, IO]) -> Snapshot:
+    """Read the :class:`Snapshot` of an XML file without building a tree.
+
+    The snapshot is the same as :meth:`JUnitXml.snapshot` would return after
+    :meth:`JUnitXml.fromfile`, but the file is fed to expat in chunks and only
+    the records are created, skipping the texts of the elements.
+
+    If *file* matches several reports of an archive, their testsuites are
+    concatenated and the statistics of their roots summed.
+
+    The ``file`` can be a file name/path, a file object or a file-like object.
+    """
+    builder = _SnapshotBuilder()
+    for source in _iter_sources(file):
+        _SnapshotReader(builder).parse(source)
+    return builder.snapshot()
+
+
+@lru_cache(maxsize=None)
+def _statistics_attrs(cls) -> List[str]:
+    """The statistics attributes that the JUnit class *cls* supports."""
+    order = getattr(
+        cls, "_statistics_order", ("tests", "failures", "errors", "skipped", "time")
+    )
+    return [
+        key for key in order if isinstance(inspect.getattr_static(cls, key, None), Attr)
+    ]
+
+
+def _set_statistics(obj: "Element", statistics: Statistics):
+    """Set the statistics attributes that the JUnit object *obj* supports."""
+    for key in _statistics_attrs(type(obj)):
+        value = getattr(statistics, key)
+        setattr(obj, key, round(value, 3) if key == "time" else value)
+
+
+# The statistics attribute counting each kind of final result, by tag.
+_RESULT_COUNTERS = {
+    Failure._tag: "failures",
+    Error._tag: "errors",
+    Skipped._tag: "skipped",
+}
+
+
+def _case_statistics(elem) -> Statistics:
+    """The statistics of the single testcase element *elem*, counted like
+    :meth:`Statistics.count` without wrapping the elements.
+    """
+    statistics = Statistics(1)
+    time = elem.get("time")
+    if time:
+        statistics.time = float(time.replace(",", ""))
+    for child in elem.iter():
+        counter = _RESULT_COUNTERS.get(child.tag)
+        if counter is not None:
+            setattr(statistics, counter, getattr(statistics, counter) + 1)
+    return statistics
+
+
+def _add_statistics(statistics: Statistics, other: Statistics, sign: int = 1):
+    """Add *other* to *statistics* in place, or subtract it if *sign* is -1."""
+    statistics.tests += sign * other.tests
+    statistics.failures += sign * other.failures
+    statistics.errors += sign * other.errors
+    statistics.skipped += sign * other.skipped
+    statistics._time += sign * other._time
+
+
+# The fields of the records of TestSuite.from_records and JUnitXml.from_records.
+_RECORD_FIELDS = (
+    "name",
+    "classname",
+    "time",
+    "status",
+    "message",
+    "text",
+    "stdout",
+    "testsuite",
+)
+
+# The result element and the statistics attribute for each status of a record.
+_RECORD_RESULTS = {
+    Status.SKIPPED: (Skipped._tag, "skipped"),
+    Status.FAILURE: (Failure._tag, "failures"),
+    Status.ERROR: (Error._tag, "errors"),
+}
+
+
+def _record_fields(record) -> tuple:
+    """The values of all :data:`_RECORD_FIELDS` of the dict or tuple *record*."""
+    if isinstance(record, dict):
+        return tuple(record.get(field) for field in _RECORD_FIELDS)
+    record = tuple(record)
+    if len(record) > len(_RECORD_FIELDS):
+        raise ValueError("Too many fields in record %r." % (record,))
+    return record + (None,) * (len(_RECORD_FIELDS) - len(record))
+
+
+def _append_record(suite_elem, fields: tuple, statistics: Statistics):
+    """Append the testcase of the record *fields* to the element *suite_elem*,
+    and count it in *statistics*.
+    """
+    name, classname, time_, status, message, text, stdout = fields[:-1]
+    attrib = {}
+    if name is not None:
+        attrib["name"] = str(name)
+    if classname is not None:
+        attrib["classname"] = str(classname)
+    if time_ is not None:
+        time_ = float(time_)
+        attrib["time"] = str(time_)
+        statistics._time += time_
+    case_elem = etree.SubElement(suite_elem, TestCase._tag, attrib)
+    statistics.tests += 1
+    if status is not None and status != Status.PASSED:
+        tag, counter = _RECORD_RESULTS[Status(status)]
+        result_elem = etree.SubElement(case_elem, tag)
+        if message is not None:
+            result_elem.set("message", str(message))
+        result_elem.text = text
+        setattr(statistics, counter, getattr(statistics, counter) + 1)
+    if stdout is not None:
+        etree.SubElement(case_elem, SystemOut._tag).text = stdout
+
+
+# The number of changes made through the API which may make kept statistics
+# and indexes stale, by the name of the slot keeping them. Kept statistics and
+# indexes remember the count they are current with, and are only trusted as
+# long as it didn't change, see _propagate and _update_indexes.
+_changes = {"_statistics": 0, "_index": 0}
+
+
+def _changed(name: str):
+    """Count a change that may make any kept statistics or index *name* stale."""
+    _changes[name] += 1
+
+
+def _reset(obj: "Element"):
+    """Forget the kept statistics and index of *obj*, if it has any."""
+    if isinstance(obj, (TestSuite, JUnitXml)):
+        obj._statistics = obj._counted_at = obj._last = None
+        obj._count = 0
+        obj._suites = ()
+        obj._index = obj._indexed_at = obj._index_last = None
+
+
+def _set_counted(obj: "Element", statistics: Statistics):
+    """Keep *statistics* as counted for the testsuite or report *obj*."""
+    _keep_counted(obj, statistics)
+    _set_statistics(obj, statistics)
+
+
+def _keep_counted(obj: "Element", statistics: Statistics):
+    """Keep *statistics* as counted for *obj* at this point."""
+    obj._statistics = statistics
+    obj._counted_at = _changes["_statistics"]
+    obj._count = len(obj._elem)
+    obj._last = _last_child(obj._elem)
+
+
+def _unknown_parent():
+    """The parent of an object whose element may be in a tree, but which
+    wasn't found in or appended to another object, see :func:`_parent_of`.
+    """
+    return None
+
+
+def _parent_of(obj: "Element") -> Optional["Element"]:
+    """The object *obj* was appended to or found in, if it is still in use and,
+    as far as can be told, still contains it.
+    """
+    parent = obj._parent
+    parent = parent() if parent is not None else None
+    if (
+        parent is not None
+        and etree.__name__ == "lxml.etree"
+        and obj._elem.getparent() is not parent._elem
+    ):
+        return None
+    return parent
+
+
+def _is_detached(obj: "Element") -> bool:
+    """Whether the element of *obj* isn't in a tree, so that changing it can't
+    make kept statistics or indexes stale.
+
+    With the standard library, elements don't know their parent, and only
+    the elements created and not appended or found since are known to be
+    detached.
+    """
+    if etree.__name__ == "lxml.etree":
+        return obj._elem.getparent() is None
+    return obj._parent is None
+
+
+def _is_root(obj: "Element") -> bool:
+    """Whether *obj* is known to contain all the objects containing it, which
+    is only known with lxml.
+    """
+    return etree.__name__ == "lxml.etree" and obj._elem.getparent() is None
+
+
+# The default "last" of _propagate and _update_indexes.
+_UNCHANGED = object()
+
+
+def _last_child(elem):
+    """The last child of *elem*, or ``None``.
+
+    Along with the number of children, the kept statistics and indexes
+    remember the last child to tell whether the children were changed outside
+    the API. Unlike ``len``, it doesn't take a walk through all the children
+    with lxml, so it is checked on each change.
+    """
+    return next(reversed(elem), None)
+
+
+def _is_counted(obj: "Element") -> bool:
+    """Whether the kept statistics of the testsuite or report *obj* are current.
+
+    Changes through the API update the statistics of the testsuites and
+    reports they are known to change, and the other kept statistics are
+    stale, as they might be changed too. They are also stale if the children
+    were changed outside the API.
+    """
+    return (
+        obj._statistics is not None
+        and obj._counted_at == _changes["_statistics"]
+        and obj._last is _last_child(obj._elem)
+        and obj._count == len(obj._elem)
+    )
+
+
+def _update_statistics_if_changed(obj: "Element"):
+    """Update the statistics of *obj* if its kept statistics weren't updated
+    by the last change. Unlike :func:`_is_counted`, children removed outside
+    the API are not noticed, as counting the children would take a walk
+    through them with lxml.
+    """
+    if obj._statistics is None or obj._counted_at != _changes["_statistics"]:
+        obj._update_statistics()
+
+
+def _children_changed(obj: "Element", last, added=(), removed=()):
+    """Update the kept statistics and indexes of *obj*, if it's a testsuite or
+    a report, and of the ones containing it, after the objects *added* were
+    appended to it and the objects *removed* removed from it, *last* being its
+    last child before the change.
+    """
+    if not isinstance(obj, (TestSuite, JUnitXml)):
+        return
+    delta = Statistics()
+    entries = []
+    removed_elems = []
+    suites_changed = False
+    for children, sign in ((added, 1), (removed, -1)):
+        for child in children:
+            if isinstance(child, TestCase) and isinstance(obj, TestSuite):
+                _add_statistics(delta, _case_statistics(child._elem), sign)
+                if sign > 0:
+                    entries.append((child._elem, obj))
+                else:
+                    removed_elems.append(child._elem)
+            elif isinstance(child, TestSuite):
+                _add_statistics(delta, child._counted(), sign)
+                suites_changed = True
+    _propagate(obj, delta, last, len(added) - len(removed))
+    if suites_changed:
+        _changed("_index")
+    else:
+        _update_indexes(obj, entries, removed_elems, last)
+
+
+def _moving(objs: List["Element"]):
+    """Count the changes of the trees the objects *objs* are about to be moved
+    from, as lxml moves appended elements.
+    """
+    if etree.__name__ == "lxml.etree" and any(
+        obj._elem.getparent() is not None for obj in objs
+    ):
+        _changed("_statistics")
+        _changed("_index")
+
+
+def _propagate(obj: "Element", delta: Statistics, last=_UNCHANGED, added: int = 0):
+    """Apply *delta*, the change of a testsuite *obj*, to the statistics of
+    *obj* and the suites and report containing it. If the change added or
+    removed children of *obj*, *last* is its last child before the change,
+    and *added* the number of children added, negative if removed.
+
+    Stale statistics are left alone to be recounted when they are needed.
+    Unless all the objects containing *obj* are known, all the other kept
+    statistics become stale.
+    """
+    changes = _changes["_statistics"]
+    updated = []
+    while True:
+        current = _last_child(obj._elem)
+        if (
+            obj._statistics is not None
+            and obj._counted_at == changes
+            and obj._last is (current if last is _UNCHANGED else last)
+        ):
+            _add_statistics(obj._statistics, delta)
+            obj._last = current
+            obj._count += added
+            _set_statistics(obj, obj._statistics)
+            updated.append(obj)
+        last = _UNCHANGED
+        added = 0
+        parent = _parent_of(obj)
+        if not isinstance(parent, (TestSuite, JUnitXml)):
+            break
+        obj = parent
+    if parent is not None or not _is_root(obj):
+        _changed("_statistics")
+        for obj in updated:
+            obj._counted_at = _changes["_statistics"]
+
+
+def _index_key(elem) -> tuple:
+    """The key of the testcase element *elem* in the testcase indexes."""
+    return (elem.get("classname"), elem.get("name"))
+
+
+def _is_indexed(obj: "Element") -> bool:
+    """Whether the index of the testsuite or report *obj* is current, see
+    :func:`_is_counted`.
+    """
+    return (
+        obj._index is not None
+        and obj._indexed_at == _changes["_index"]
+        and obj._index_last is _last_child(obj._elem)
+    )
+
+
+def _keep_index(obj: "Element", index: dict):
+    """Keep *index* as built for *obj* at this point."""
+    obj._index = index
+    obj._indexed_at = _changes["_index"]
+    obj._index_last = _last_child(obj._elem)
+
+
+def _update_indexes(obj: "Element", added=(), removed=(), last=_UNCHANGED):
+    """Add the index entries *added* and remove the testcase elements *removed*
+    from the indexes of the testsuite *obj*, whose last child was *last*
+    before the change, and of the suites and report containing it.
+
+    Stale indexes are dropped to be rebuilt when they are needed, and unless
+    all the objects containing *obj* are known, all the other indexes become
+    stale, see :func:`_propagate`.
+    """
+    changes = _changes["_index"]
+    updated = []
+    while True:
+        index = obj._index
+        current = _last_child(obj._elem)
+        if (
+            index is not None
+            and obj._indexed_at == changes
+            and obj._index_last is (current if last is _UNCHANGED else last)
+        ):
+            for entry in added:
+                index.setdefault(_index_key(entry[0]), []).append(entry)
+            for elem in removed:
+                key = _index_key(elem)
+                entries = [
+                    entry for entry in index.get(key, ()) if entry[0] is not elem
+                ]
+                if entries:
+                    index[key] = entries
+                else:
+                    index.pop(key, None)
+            obj._index_last = current
+            updated.append(obj)
+        else:
+            obj._index = None
+        last = _UNCHANGED
+        parent = _parent_of(obj)
+        if not isinstance(parent, (TestSuite, JUnitXml)):
+            break
+        obj = parent
+    if parent is not None or not _is_root(obj):
+        _changed("_index")
+        for obj in updated:
+            obj._indexed_at = _changes["_index"]
+
+
+def _remove_testcases(suite: "TestSuite", predicate) -> int:
+    """Remove the testcases of *suite* and its nested testsuites for which
+    *predicate* returns true, and return how many were removed.
+
+    The children of each testsuite are replaced at once, as removing them one
+    by one is quadratic with the standard library.
+    """
+    case_cls = suite.testcase
+    parent = weakref.ref(suite)
+    last = _last_child(suite._elem)
+    kept = []
+    removed = []
+    suites = []
+    for elem in suite._elem:
+        if elem.tag == case_cls._tag:
+            case = _child(suite, case_cls, elem, parent)
+            if predicate(case):
+                case._parent = None
+                removed.append(case)
+                continue
+        elif elem.tag == suite._tag:
+            suites.append(_child(suite, type(suite), elem, parent))
+        kept.append(elem)
+    if removed:
+        suite._elem[:] = kept
+        _children_changed(suite, last, removed=removed)
+    count = len(removed)
+    for nested in suites:
+        count += _remove_testcases(nested, predicate)
+    return count
+
+
+def _find(obj: "Element", classname, name, attrs: dict) -> Optional["TestCase"]:
+    """The first testcase named *name* of class *classname* in the indexed
+    testsuite or report *obj*, with the attributes *attrs*.
+    """
+    for elem, suite in obj._testcase_index().get((classname, name), ()):
+        if all(elem.get(key) == value for key, value in attrs.items()):
+            return _child(suite, suite.testcase, elem)
+    return None
+
+
+def _contains(obj: "Element", item) -> bool:
+    """Whether the testcase or (classname, name) *item* is in the indexed
+    testsuite or report *obj*.
+    """
+    if isinstance(item, TestCase):
+        return any(
+            _child(suite, suite.testcase, elem) == item
+            for elem, suite in obj._testcase_index().get(_index_key(item._elem), ())
+        )
+    return bool(obj._testcase_index().get(item))
+
+
+# The conditions on the final results of a testcase with each status, which
+# follow the precedence of TestCase.status.
+_STATUS_XPATHS = {
+    Status.PASSED: "not(skipped) and not(failure) and not(error)",
+    Status.SKIPPED: "skipped and not(failure) and not(error)",
+    Status.FAILURE: "failure and not(error)",
+    Status.ERROR: "error",
+}
+
+# Compiled lxml queries, cached per thread as they can't be used concurrently.
+_queries = threading.local()
+
+
+def _select(obj: "Element", **criteria) -> List["TestCase"]:
+    """The testcases of the testsuite or report *obj* that match *criteria*,
+    the arguments of :meth:`TestSuite.select`.
+    """
+    criteria = {key: value for key, value in criteria.items() if value is not None}
+    if "status" in criteria:
+        criteria["status"] = Status(criteria["status"])
+    if etree.__name__ == "lxml.etree":
+        query, variables = _compiled_query(criteria)
+        # The wrappers of the testsuites the testcases are found in, by element.
+        owners = {obj._elem: obj}
+        selected = []
+        for elem in query(obj._elem, **variables):
+            owner = _selected_owner(owners, elem.getparent())
+            selected.append(_child(owner, owner.testcase, elem))
+        return selected
+    match = _query_matcher(criteria)
+    selected = []
+    suites = [obj] if isinstance(obj, TestSuite) else list(obj)
+    for suite in suites:
+        _select_python(suite, match, selected)
+    return selected
+
+
+def _glob_condition(attr: str, pattern: str) -> Tuple[str, str]:
+    """The XPath condition matching the attribute *attr* against the fnmatch
+    *pattern*, and the value of its variable.
+
+    Patterns without wildcards or with a single trailing ``*`` are compared
+    by lxml directly, others are matched with EXSLT regular expressions.
+    """
+    variable = "$%s_glob" % attr
+    if not any(char in pattern for char in "*?["):
+        return "@%s = %s" % (attr, variable), pattern
+    prefix = pattern[:-1]
+    if pattern.endswith("*") and not any(char in prefix for char in "*?["):
+        return "@%s and starts-with(@%s, %s)" % (attr, attr, variable), prefix
+    # fnmatch patterns are anchored at the end only, and EXSLT's re:test
+    # searches rather than matches.
+    return (
+        "@%s and re:test(@%s, %s)" % (attr, attr, variable),
+        r"\A" + fnmatch.translate(pattern),
+    )
+
+
+def _compiled_query(criteria: dict) -> Tuple[Callable, dict]:
+    """The lxml XPath query selecting the testcases matching *criteria*, and
+    the values of its variables.
+
+    Queries are compiled once per thread and per form of criteria, their
+    values being passed as variables.
+    """
+    conditions = []
+    variables = {}
+    # The results are checked first, as it's cheaper than reading attributes.
+    if "status" in criteria:
+        conditions.append(_STATUS_XPATHS[criteria["status"]])
+    for attr in ("classname", "name"):
+        if attr in criteria:
+            conditions.append("@%s = $%s" % (attr, attr))
+            variables[attr] = criteria[attr]
+        if attr + "_glob" in criteria:
+            condition, variables[attr + "_glob"] = _glob_condition(
+                attr, criteria[attr + "_glob"]
+            )
+            conditions.append(condition)
+    # Times may have thousands separators, see FloatAttr.
+    seconds = "number(translate(@time, ',', ''))"
+    if "min_time" in criteria:
+        conditions.append("%s >= $min_time" % seconds)
+        variables["min_time"] = float(criteria["min_time"])
+    if "max_time" in criteria:
+        conditions.append("%s <= $max_time" % seconds)
+        variables["max_time"] = float(criteria["max_time"])
+    conditions.append("parent::%s" % TestSuite._tag)
+    path = "descendant::%s[%s]" % (
+        TestCase._tag,
+        " and ".join("(%s)" % condition for condition in conditions),
+    )
+    cache = getattr(_queries, "cache", None)
+    if cache is None:
+        cache = _queries.cache = {}
+    query = cache.get(path)
+    if query is None:
+        query = cache[path] = etree.XPath(
+            path, namespaces={"re": "http://exslt.org/regular-expressions"}
+        )
+    return query, variables
+
+
+def _selected_owner(owners: dict, elem) -> "Element":
+    """The wrapper of the testsuite element *elem*, found with lxml, linked
+    to the wrappers of the testsuites up to the one searched, which are kept
+    in *owners*, so that changes to its testcases are propagated.
+    """
+    owner = owners.get(elem)
+    if owner is None:
+        parent = _selected_owner(owners, elem.getparent())
+        suite_class = parent.testsuite if isinstance(parent, JUnitXml) else type(parent)
+        owner = owners[elem] = _child(parent, suite_class, elem)
+    return owner
+
+
+def _query_matcher(criteria: dict) -> Callable[[Element], bool]:
+    """A function telling whether a testcase element matches *criteria*."""
+    checks = []
+    status = criteria.get("status")
+    if status is not None:
+
+        def check_status(elem):
+            results = 0
+            for child in elem:
+                results |= _RESULT_BITS.get(child.tag, 0)
+            return _status(results) is status
+
+        checks.append(check_status)
+    for attr in ("classname", "name"):
+        value = criteria.get(attr)
+        if value is not None:
+            checks.append(lambda elem, attr=attr, value=value: elem.get(attr) == value)
+        pattern = criteria.get(attr + "_glob")
+        if pattern is not None:
+            checks.append(
+                lambda elem, attr=attr, pattern=pattern: (
+                    elem.get(attr) is not None
+                    and fnmatch.fnmatchcase(elem.get(attr), pattern)
+                )
+            )
+    min_time, max_time = criteria.get("min_time"), criteria.get("max_time")
+    if min_time is not None or max_time is not None:
+        low = -math.inf if min_time is None else float(min_time)
+        high = math.inf if max_time is None else float(max_time)
+
+        def check_time(elem):
+            value = elem.get("time")
+            try:
+                return low <= float(value.replace(",", "")) <= high
+            except (AttributeError, ValueError):
+                return False
+
+        checks.append(check_time)
+    return lambda elem: all(check(elem) for check in checks)
+
+
+def _select_python(suite: "TestSuite", match: Callable, selected: list):
+    """Append the testcases of *suite* and of its nested testsuites for which
+    *match* returns true to *selected*, in document order.
+    """
+    for elem in suite._elem:
+        if elem.tag == suite.testcase._tag:
+            if match(elem):
+                selected.append(_child(suite, suite.testcase, elem))
+        elif elem.tag == suite._tag:
+            nested = _child(suite, type(suite), elem)
+            _select_python(nested, match, selected)
+
+
+class _StopParsing(Exception):
+    """Raised by expat handlers to stop parsing early."""
+
+
+class _StatisticsCounter:
+    """Count the tests of each top-level testsuite with expat.
+
+    The attributes declared by the root and the top-level testsuites are kept
+    as well. If *stop_at_root* is given, it's called with the tag and the
+    attributes of the root, and parsing stops right there if it returns true.
+    """
+
+    def __init__(self, stop_at_root=None):
+        self.stop_at_root = stop_at_root
+        self.root_tag = None
+        self.root_attrib = None
+        self.suite_attribs = []
+        self.statistics = []
+        self._tags = []
+        # The depth of the testcase being counted, if any.
+        self._case_depth = None
+        self._suite_time = 0
+
+    def parse(self, source, chunk_size: int = 64 * 1024) -> bool:
+        """Parse *source*, returning whether it has been read completely."""
+        parser = expat.ParserCreate()
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        try:
+            while True:
+                data = source.read(chunk_size)
+                if not data:
+                    break
+                parser.Parse(data, False)
+            parser.Parse(b"", True)
+        except _StopParsing:
+            return False
+        return True
+
+    def _is_top_level_suite(self, tag):
+        tags = self._tags
+        return tag == "testsuite" and (
+            not tags or len(tags) == 1 and tags[0] == "testsuites"
+        )
+
+    def _start(self, tag, attrib):
+        tags = self._tags
+        if not tags:
+            if tag not in ("testsuites", "testsuite"):
+                raise JUnitXmlError("Invalid format.")
+            self.root_tag = tag
+            self.root_attrib = attrib
+        if self._is_top_level_suite(tag):
+            self.suite_attribs.append(attrib)
+            self.statistics.append(Statistics())
+        elif self._case_depth is not None:
+            if tag == "failure":
+                self.statistics[-1].failures += 1
+            elif tag == "error":
+                self.statistics[-1].errors += 1
+            elif tag == "skipped":
+                self.statistics[-1].skipped += 1
+        elif tag == "testcase" and self.statistics and tags[-1] == "testsuite":
+            self._case_depth = len(tags)
+            self.statistics[-1].tests += 1
+            time = attrib.get("time")
+            if time:
+                self._suite_time += float(time.replace(",", ""))
+        tags.append(tag)
+        if len(tags) == 1 and self.stop_at_root and self.stop_at_root(tag, attrib):
+            raise _StopParsing()
+
+    def _end(self, tag):
+        self._tags.pop()
+        if len(self._tags) == self._case_depth:
+            self._case_depth = None
+        elif self._is_top_level_suite(tag):
+            self.statistics[-1].time = self._suite_time
+            self._suite_time = 0
+
+
+def _float_value(value: Optional[str]) -> Optional[float]:
+    """The value of a float attribute, see :class:`FloatAttr`."""
+    return float(value.replace(",", "")) if value else None
+
+
+def _int_value(value: Optional[str]) -> Optional[int]:
+    """The value of an integer attribute, see :class:`IntAttr`."""
+    return int(value) if value else None
+
+
+class _SnapshotBuilder:
+    """Build a :class:`Snapshot` from the attributes of the elements of one or
+    more reports.
+
+    Equal strings are shared between the records, so that the classnames,
+    messages and other values repeated throughout a report are stored once,
+    and pickled once.
+    """
+
+    def __init__(self):
+        # The attributes of the root of each report, None for a testsuite.
+        self.roots = []
+        self.suites = []
+        self._strings = {}
+
+    def _intern(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def open_suite(self) -> int:
+        """Reserve the place of a testsuite, which is added on closing."""
+        self.suites.append(None)
+        return len(self.suites) - 1
+
+    def close_suite(self, index: int, attrib, cases: List[CaseRecord]):
+        """Add the testsuite with the attributes *attrib* and the *cases*."""
+        intern, get = self._intern, attrib.get
+        self.suites[index] = SuiteRecord(
+            intern(get("name")),
+            intern(get("hostname")),
+            _float_value(get("time")),
+            intern(get("timestamp")),
+            _int_value(get("tests")),
+            _int_value(get("failures")),
+            _int_value(get("errors")),
+            _int_value(get("skipped")),
+            tuple(cases),
+        )
+
+    def case(self, attrib, results: int, message: Optional[str]) -> CaseRecord:
+        """The record of a testcase with the attributes *attrib*, the kinds of
+        final results *results*, see _RESULT_BITS, and the *message*.
+        """
+        get = attrib.get
+        return CaseRecord(
+            get("name"),
+            self._intern(get("classname")),
+            _float_value(get("time")),
+            _status(results),
+            self._intern(message),
+        )
+
+    def snapshot(self) -> Snapshot:
+        suites = tuple(self.suites)
+        if len(self.roots) == 1:
+            get = (self.roots[0] or {}).get
+            return Snapshot(
+                get("name"),
+                _float_value(get("time")),
+                _int_value(get("tests")),
+                _int_value(get("failures")),
+                _int_value(get("errors")),
+                _int_value(get("skipped")),
+                suites,
+            )
+        statistics = []
+        for name, value_of in (
+            ("time", _float_value),
+            ("tests", _int_value),
+            ("failures", _int_value),
+            ("errors", _int_value),
+            ("skipped", _int_value),
+        ):
+            values = [value_of(root.get(name)) if root else None for root in self.roots]
+            statistics.append(None if None in values or not values else sum(values))
+        return Snapshot(None, *statistics, suites)
+
+
+class _SnapshotReader:
+    """Read the records of a report into a :class:`_SnapshotBuilder` with
+    expat, without handling the texts.
+    """
+
+    def __init__(self, builder: _SnapshotBuilder):
+        self.builder = builder
+        self._tags = []
+        # The place, attributes and testcases of each open testsuite.
+        self._suites = []
+        # The depth and attributes of the testcase being read, if any, and
+        # its final results found so far, see _add_final_result.
+        self._case_depth = None
+        self._case_attrib = None
+        self._found = _NO_FINAL_RESULTS
+
+    def parse(self, source, chunk_size: int = 64 * 1024):
+        parser = expat.ParserCreate()
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        while True:
+            data = source.read(chunk_size)
+            if not data:
+                break
+            parser.Parse(data, False)
+        parser.Parse(b"", True)
+
+    def _start(self, tag, attrib):
+        tags = self._tags
+        if not tags:
+            if tag not in ("testsuites", "testsuite"):
+                raise JUnitXmlError("Invalid format.")
+            self.builder.roots.append(attrib if tag == "testsuites" else None)
+        if self._case_depth is not None:
+            if len(tags) == self._case_depth + 1 and tag in _MESSAGE_PRECEDENCE:
+                self._found = _add_final_result(self._found, tag, attrib)
+        elif tag == "testsuite":
+            self._suites.append((self.builder.open_suite(), attrib, []))
+        elif tag == "testcase" and tags and tags[-1] == "testsuite":
+            self._case_depth = len(tags)
+            self._case_attrib = attrib
+            self._found = _NO_FINAL_RESULTS
+        tags.append(tag)
+
+    def _end(self, tag):
+        tags = self._tags
+        tags.pop()
+        if self._case_depth is not None:
+            if len(tags) == self._case_depth:
+                results, _, message = self._found
+                case = self.builder.case(self._case_attrib, results, message)
+                self._suites[-1][2].append(case)
+                self._case_depth = None
+        elif tag == "testsuite":
+            self.builder.close_suite(*self._suites.pop())
+
+
+def _text_tags() -> set:
+    """The tags of the elements whose text is accessed through a ``text`` property."""
+    tags = set()
+    classes = [Result, System]
+    while classes:
+        cls = classes.pop()
+        classes.extend(cls.__subclasses__())
+        if cls._tag:
+            tags.add(cls._tag)
+    return tags
+
+
+class _LazyTextBuilder:
+    """Build the tree of the file *path* with expat, leaving out texts.
+
+    The text of the elements with one of the *tags* is not loaded if it is
+    longer than *threshold* characters. Its byte offset and length in the file
+    are recorded in the ``_LAZY_TEXT`` attribute instead, see :func:`_get_text`.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], tags: set, threshold=256):
+        if not isinstance(path, (str, os.PathLike)) or _split_archive_path(path):
+            raise ValueError("lazy_text requires the path of a local file.")
+        self.path = os.path.abspath(path)
+        self.tags = tags
+        self.threshold = threshold
+        self._builder = etree.TreeBuilder()
+        self._parser = None
+        # Whether the encoding allows to read the texts back on their own.
+        self._lazy = True
+        # The element whose text is being read, the byte offset of the text,
+        # and the text itself until it is longer than the threshold.
+        self._elem = None
+        self._start_index = None
+        self._data = []
+        self._length = 0
+
+    def parse(self, chunk_size: int = 64 * 1024):
+        """Parse the file and return its root element."""
+        parser = expat.ParserCreate(namespace_separator=" ")
+        parser.XmlDeclHandler = self._xml_decl
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._char_data
+        parser.StartCdataSectionHandler = self._start_cdata
+        self._parser = parser
+        with open(self.path, "rb") as source:
+            if _compression(source):
+                raise ValueError("lazy_text requires an uncompressed file.")
+            while True:
+                data = source.read(chunk_size)
+                if not data:
+                    break
+                parser.Parse(data, False)
+            parser.Parse(b"", True)
+        root = self._builder.close()
+        if root.tag not in ("testsuites", "testsuite"):
+            raise JUnitXmlError("Invalid format.")
+        return root
+
+    @staticmethod
+    def _name(name):
+        # expat separates the namespace URI from the local name with a space.
+        if " " in name:
+            return "{%s}%s" % tuple(name.split(" ", 1))
+        return name
+
+    def _xml_decl(self, version, encoding, standalone):
+        if encoding and encoding.lower() not in ("utf-8", "utf8", "us-ascii", "ascii"):
+            self._lazy = False
+
+    def _start(self, tag, attrib):
+        self._end_text()
+        tag = self._name(tag)
+        attrib = {self._name(key): value for key, value in attrib.items()}
+        elem = self._builder.start(tag, attrib)
+        if self._lazy and tag in self.tags:
+            self._elem = elem
+
+    def _end(self, tag):
+        self._end_text()
+        self._builder.end(self._name(tag))
+
+    def _start_cdata(self):
+        if self._elem is not None and self._start_index is None:
+            self._start_index = self._parser.CurrentByteIndex
+
+    def _char_data(self, data):
+        if self._elem is None:
+            self._builder.data(data)
+            return
+        if self._start_index is None:
+            self._start_index = self._parser.CurrentByteIndex
+        if self._data is not None:
+            self._data.append(data)
+            self._length += len(data)
+            if self._length > self.threshold:
+                self._data = None
+
+    def _end_text(self):
+        """Record or load the text that ends at the current tag."""
+        if self._elem is None:
+            return
+        if self._data is not None:
+            if self._data:
+                self._builder.data("".join(self._data))
+        else:
+            length = self._parser.CurrentByteIndex - self._start_index
+            self._elem.set(_LAZY_TEXT, f"{self._start_index} {length} {self.path}")
+        self._elem = None
+        self._start_index = None
+        self._data = []
+        self._length = 0
@@ -18,12 +18,16 @@ from . import junitparser
 
 
 class StackTrace(junitparser.System):
+    __slots__ = ()
+
     _tag = "stackTrace"
 
 
 class InterimResult(junitparser.Result):
     """Base class for intermediate (rerun and flaky) test result (in contrast to JUnit FinalResult)."""
 
+    __slots__ = ()
+
     _tag = None
 
     @property
@@ -82,18 +86,26 @@ class InterimResult(junitparser.Result):
 
 
 class RerunFailure(InterimResult):
+    __slots__ = ()
+
     _tag = "rerunFailure"
 
 
 class RerunError(InterimResult):
+    __slots__ = ()
+
     _tag = "rerunError"
 
 
 class FlakyFailure(InterimResult):
+    __slots__ = ()
+
     _tag = "flakyFailure"
 
 
 class FlakyError(InterimResult):
+    __slots__ = ()
+
     _tag = "flakyError"
 
 
@@ -101,6 +113,8 @@ R = TypeVar("R", bound=InterimResult)
 
 
 class TestCase(junitparser.TestCase):
+    __slots__ = ()
+
     group = junitparser.Attr()
 
     # XUnit2 TestCase children are JUnit children and intermediate results
@@ -188,6 +202,8 @@ class TestCase(junitparser.TestCase):
 class TestSuite(junitparser.TestSuite):
     """TestSuite for Pytest, with some different attributes."""
 
+    __slots__ = ()
+
     group = junitparser.Attr()
     id = junitparser.Attr()
     package = junitparser.Attr()
@@ -240,22 +256,9 @@ class TestSuite(junitparser.TestSuite):
 
 
 class JUnitXml(junitparser.JUnitXml):
+    __slots__ = ()
+
     # Pytest and xunit schema doesn't have "skipped" in testsuites
     skipped = None
 
     testsuite = TestSuite
-
-    def update_statistics(self):
-        """Update test count, time, etc."""
-        time = 0
-        tests = failures = errors = 0
-        for suite in self:
-            suite.update_statistics()
-            tests += suite.tests
-            failures += suite.failures
-            errors += suite.errors
-            time += suite.time
-        self.tests = tests
-        self.failures = failures
-        self.errors = errors
-        self.time = round(time, 3)
@@ -0,0 +1,75 @@
+import math
+
+import pytest
+
+from src.junitparser import JUnitXml, Status, analytics
+
+REPORT = """<testsuites>
+<testsuite name="one">
+<testcase classname="a" name="t1" time="1"/>
+<testcase classname="a" name="t2" time="2"><failure/></testcase>
+<testcase classname="b" name="t3" time="4"><skipped/></testcase>
+<testcase classname="b" name="t4"><error/></testcase>
+</testsuite>
+<testsuite name="two">
+<testcase classname="a" name="t5" time="10"/>
+</testsuite>
+</testsuites>"""
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(analytics, "numpy", None)
+    return request.param
+
+
+def test_summarize_by_suite(backend):
+    summaries = analytics.summarize(JUnitXml.fromstring(REPORT), bins=4)
+    assert list(summaries) == ["one", "two"]
+    one = summaries["one"]
+    assert one.count == 4
+    assert one.total == 7.0
+    assert one.percentiles == pytest.approx({50: 2.0, 95: 3.8, 99: 3.96})
+    assert one.statuses == {
+        Status.PASSED: 1,
+        Status.SKIPPED: 1,
+        Status.FAILURE: 1,
+        Status.ERROR: 1,
+    }
+    counts, edges = one.histogram
+    assert counts == [1, 1, 0, 1]
+    assert edges == pytest.approx([1.0, 1.75, 2.5, 3.25, 4.0])
+    two = summaries["two"]
+    assert (two.count, two.total, two.percentiles[50]) == (1, 10.0, 10.0)
+    assert two.histogram == ([0, 0, 1, 0], [9.5, 9.75, 10.0, 10.25, 10.5])
+
+
+def test_summarize_by_classname_and_overall(backend):
+    xml = JUnitXml.fromstring(REPORT)
+    by_classname = analytics.summarize(xml, by="classname", percentiles=(0, 100))
+    assert list(by_classname) == ["a", "b"]
+    assert by_classname["a"].percentiles == {0: 1.0, 100: 10.0}
+    assert by_classname["b"].count == 2
+    assert by_classname["b"].percentiles == {0: 4.0, 100: 4.0}
+    overall = analytics.summarize(xml.to_columns(), by=None)
+    assert list(overall) == [None]
+    assert overall[None].count == 5
+    assert overall[None].statuses[Status.PASSED] == 2
+    assert overall[None].todict()["statuses"]["error"] == 1
+
+
+def test_summarize_without_times(backend):
+    xml = JUnitXml.fromstring("<testsuite name='s'><testcase name='t'/></testsuite>")
+    summary = analytics.summarize(xml)["s"]
+    assert (summary.count, summary.total) == (1, 0.0)
+    assert all(math.isnan(value) for value in summary.percentiles.values())
+    assert summary.histogram[0] == [0] * 10
+    assert analytics.summarize(JUnitXml(), by=None) == {}
+
+
+def test_summarize_invalid_group():
+    with pytest.raises(ValueError):
+        analytics.summarize(JUnitXml(), by="time")
@@ -1,7 +1,10 @@
+import gzip
+import json
+import zipfile
 from pathlib import Path
 import pytest
 from src.junitparser import cli
-from src.junitparser import version
+from src.junitparser import JUnitXml, version
 
 DATA_DIR = Path(__file__).parent / "data"
 
@@ -15,6 +18,113 @@ def test_verify(file: str, expected_exitcode: int):
     assert cli.verify([path]) == expected_exitcode
 
 
+def test_verify_stops_at_first_failure(tmp_path: Path):
+    path = tmp_path / "truncated.xml"
+    path.write_text(
+        '<testsuites><testsuite name="suite">'
+        '<testcase name="case1"><failure message="failed"/></testcase>'
+        '<testcase name="case2">'
+        + "<system-out>output</system-out>" * 10000
+        + "<not-closed>"
+    )
+    assert cli.verify([path, tmp_path / "does-not-exist.xml"]) == 1
+
+
+def test_verify_skipped_failure(tmp_path: Path):
+    # A skipped testcase passes verification, even if it also failed.
+    path = tmp_path / "skipped.xml"
+    path.write_text(
+        '<testsuites><testsuite name="suite"><testcase name="case">'
+        "<skipped/><failure/></testcase></testsuite></testsuites>"
+    )
+    assert cli.verify([path]) == 0
+
+
+def test_verify_all_files(tmp_path: Path):
+    with pytest.raises(FileNotFoundError):
+        cli.verify([DATA_DIR / "no_fails.xml", tmp_path / "does-not-exist.xml"])
+
+
+def test_stats(capsys: pytest.CaptureFixture):
+    files = [DATA_DIR / "jenkins.xml", DATA_DIR / "pytest_error.xml"]
+    assert cli.main(["stats", *map(str, files)]) == 0
+    output = json.loads(capsys.readouterr().out)
+    assert output["files"][str(files[0])] == {
+        "tests": 3,
+        "failures": 1,
+        "errors": 0,
+        "skipped": 1,
+        "time": 0.006,
+    }
+    assert output["total"] == {
+        "tests": 4,
+        "failures": 2,
+        "errors": 0,
+        "skipped": 1,
+        "time": 0.007,
+    }
+
+
+def test_stats_follow(tmp_path: Path, capsys: pytest.CaptureFixture):
+    path = tmp_path / "unfinished.xml"
+    path.write_text('<testsuites><testsuite name="suite"><testcase name="case"/>')
+    assert cli.main(["stats", "--follow", "--timeout", "0.05", str(path)]) == 1
+    with open(path, "a") as f:
+        f.write("</testsuite></testsuites>")
+    assert cli.main(["stats", "--follow", str(path)]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0]) == json.loads(lines[1])
+    assert json.loads(lines[1]) == {
+        "file": str(path),
+        "tests": 1,
+        "failures": 0,
+        "errors": 0,
+        "skipped": 0,
+        "time": 0,
+    }
+
+
+def test_stats_follow_timeout(tmp_path: Path, capsys: pytest.CaptureFixture):
+    unfinished = tmp_path / "unfinished.xml"
+    unfinished.write_text('<testsuites><testsuite name="suite">')
+    args = ["stats", "--follow", "--timeout", "0.05"]
+    assert cli.main([*args, str(unfinished), str(DATA_DIR / "no_fails.xml")]) == 1
+    output = capsys.readouterr()
+    assert str(unfinished) in output.err
+    assert "no_fails.xml" not in output.out
+
+
+def test_compressed_reports(tmp_path: Path, capsys: pytest.CaptureFixture):
+    for file in ("no_fails.xml", "pytest_success.xml"):
+        (tmp_path / f"{file}.gz").write_bytes(
+            gzip.compress((DATA_DIR / file).read_bytes())
+        )
+    glob = str(tmp_path / "*.xml.gz")
+    assert cli.main(["verify", "--glob", glob]) == 0
+    assert cli.main(["stats", "--glob", glob]) == 0
+    assert json.loads(capsys.readouterr().out)["total"]["tests"] == 4
+    outfile = tmp_path / "merged.xml"
+    assert cli.main(["merge", "--glob", glob, str(outfile)]) == 0
+    assert JUnitXml.fromfile(str(outfile)).tests == 4
+
+
+def test_archived_reports(tmp_path: Path, capsys: pytest.CaptureFixture):
+    for index in range(2):
+        with zipfile.ZipFile(tmp_path / f"artifacts{index}.zip", "w") as zip_file:
+            zip_file.write(DATA_DIR / "no_fails.xml", "reports/TEST-no-fails.xml")
+            zip_file.write(DATA_DIR / "pytest_success.xml", "TEST-pytest.xml")
+    glob = str(tmp_path / "artifacts*.zip") + "!**/TEST-*.xml"
+    assert cli.main(["verify", "--glob", glob]) == 0
+    assert cli.main(["stats", "--glob", glob]) == 0
+    assert json.loads(capsys.readouterr().out)["total"]["tests"] == 8
+    outfile = tmp_path / "merged.xml"
+    assert cli.main(["merge", "--glob", glob, str(outfile)]) == 0
+    assert JUnitXml.fromfile(str(outfile)).tests == 8
+    assert cli.main(["merge", "--stream", "--glob", glob, str(outfile)]) == 0
+    assert JUnitXml.fromfile(str(outfile)).tests == 8
+
+
 def test_merge(tmp_path: Path):
     files = [DATA_DIR / "jenkins.xml", DATA_DIR / "pytest_success.xml"]
     suites = ["JUnitXmlReporter", "JUnitXmlReporter.constructor", "pytest"]
@@ -25,6 +135,70 @@ def test_merge(tmp_path: Path):
         assert f'name="{s}"' in xml
 
 
+def test_merge_stream(tmp_path: Path):
+    files = [DATA_DIR / "jenkins.xml", DATA_DIR / "pytest_success.xml"]
+    expected_file = tmp_path / "expected.xml"
+    cli.merge(files, str(expected_file))
+    expected = JUnitXml.fromfile(str(expected_file))
+    outfile = tmp_path / "merged.xml"
+    assert cli.merge_stream(files, str(outfile), "merged") == 0
+    xml = JUnitXml.fromfile(str(outfile))
+    assert xml.name == "merged"
+    assert [s.name for s in xml] == [
+        "JUnitXmlReporter",
+        "JUnitXmlReporter.constructor",
+        "pytest",
+    ]
+    for attr in ("tests", "failures", "errors", "skipped", "time"):
+        assert getattr(xml, attr) == getattr(expected, attr)
+    assert len(list(xml)[1]) == 3
+
+
+def test_merge_stream_output_to_terminal(capsys: pytest.CaptureFixture):
+    ret = cli.main(["merge", "--stream", str(DATA_DIR / "no_suites_tag.xml"), "-"])
+    assert ret == 0
+    captured = capsys.readouterr()
+    assert captured.out.startswith("<?xml version='1.0'")
+    xml = JUnitXml.fromstring(captured.out.encode())
+    assert xml.tests == 3
+    assert xml.failures == 1
+    assert xml.skipped == 1
+    assert [s.name for s in xml] == ["JUnitXmlReporter.constructor"]
+
+
+@pytest.fixture
+def huge_output_file(tmp_path: Path):
+    path = tmp_path / "huge.xml"
+    path.write_text(
+        '<testsuites><testsuite name="suite"><testcase name="case"><system-out>'
+        + "x" * 12_000_000
+        + '</system-out></testcase><testcase name="failed"><failure/></testcase>'
+        "</testsuite></testsuites>"
+    )
+    return path
+
+
+def test_verify_huge_tree(huge_output_file: Path):
+    assert cli.main(["verify", "--huge-tree", str(huge_output_file)]) == 1
+
+
+@pytest.mark.parametrize("stream", [[], ["--stream"]])
+def test_merge_huge_tree(tmp_path: Path, huge_output_file: Path, stream: list):
+    outfile = tmp_path / "merged.xml"
+    args = ["merge", *stream, "--huge-tree", str(huge_output_file), str(outfile)]
+    assert cli.main(args) == 0
+    xml = JUnitXml.fromfile(str(outfile), lazy_text=True)
+    assert (xml.tests, xml.failures) == (2, 1)
+    ((case, _),) = xml
+    assert len(case.system_out) == 12_000_000
+
+
+def test_follow_stats_huge_tree(huge_output_file: Path, capsys: pytest.CaptureFixture):
+    assert cli.main(["stats", "--follow", "--huge-tree", str(huge_output_file)]) == 0
+    last = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert (last["tests"], last["failures"]) == (2, 1)
+
+
 def test_merge_output_to_terminal(capsys: pytest.CaptureFixture):
     ret = cli.main(["merge", str(DATA_DIR / "normal.xml"), "-"])
     assert ret == 0
@@ -38,6 +212,15 @@ def test_verify_with_glob():
     assert ret == 1
 
 
+def test_verify_with_negated_glob(capsys: pytest.CaptureFixture):
+    # The "!" of a character class doesn't separate an archive member.
+    glob = str(DATA_DIR / "pytest_[!s]*.xml")
+    assert cli.main(["verify", "--glob", glob]) == 1
+    assert cli.main(["stats", "--glob", glob]) == 0
+    output = json.loads(capsys.readouterr().out)
+    assert list(output["files"]) == [str(DATA_DIR / "pytest_error.xml")]
+
+
 class Test_CommandlineOptions:
     @classmethod
     def setup_class(cls):
@@ -55,16 +238,16 @@ class Test_CommandlineOptions:
         with pytest.raises(SystemExit) as e:
             self.parser.parse_args(["--help"])
         captured = capsys.readouterr()
-        assert "{merge,verify} ...\n" in captured.out
+        assert "{merge,verify,stats} ...\n" in captured.out
         assert e.value.code == 0
 
-    @pytest.mark.parametrize("command", ["merge", "verify"])
+    @pytest.mark.parametrize("command", ["merge", "verify", "stats"])
     def test_subcommand_help(self, command):
         with pytest.raises(SystemExit) as e:
             self.parser.parse_args([command, "--help"])
         assert e.value.code == 0
 
-    @pytest.mark.parametrize("command", ["merge", "verify"])
+    @pytest.mark.parametrize("command", ["merge", "verify", "stats"])
     def test_subcommands_help_general_options(self, command, capsys):
         with pytest.raises(SystemExit):
             self.parser.parse_args([command, "--help"])
@@ -97,6 +280,12 @@ class Test_CommandlineOptions:
         args = self.parser.parse_args(["merge", *files, "-"])
         assert args.paths == files
 
+    def test_merge_option_stream(self):
+        args = self.parser.parse_args(["merge", "--stream", "_", "-"])
+        assert args.stream
+        args = self.parser.parse_args(["merge", "_", "-"])
+        assert not args.stream
+
     def test_merge_option_suite_name(self):
         args = self.parser.parse_args(["merge", "--suite-name", "foo", "_", "-"])
         assert args.suite_name == "foo"
@@ -1,6 +1,17 @@
+import bz2
+import gc
+import gzip
+import lzma
+import mmap
 import os
+import pickle
 import pytest
 import sys
+import tarfile
+import threading
+import time
+import weakref
+import zipfile
 from io import StringIO
 from unittest import skipIf
 from src.junitparser import (
@@ -10,6 +21,12 @@ from src.junitparser import (
     Failure,
     JUnitXmlError,
     JUnitXml,
+    JUnitXmlPullParser,
+    SystemOut,
+    Statistics,
+    get_parser,
+    read_snapshot,
+    read_statistics,
 )
 
 try:
@@ -69,6 +86,12 @@ def test_fromfile_filelike_obj():
     do_test_fromfile(FileObject())
 
 
+def test_fromfile_mmap():
+    with open(os.path.join(os.path.dirname(__file__), "data/normal.xml"), "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            do_test_fromfile(mm)
+
+
 # TODO: fix the test which is failing on non-Windows platforms
 @skipIf(
     not has_lxml or sys.platform != "win32",
@@ -208,3 +231,684 @@ def test_multi_results_in_case():
     case = next(iter(suite))
     assert isinstance(case, TestCase)
     assert len(case.result) == 2
+
+
+def test_iterfile():
+    path = os.path.join(os.path.dirname(__file__), "data/normal.xml")
+    cases = list(JUnitXml.iterfile(path))
+    assert len(cases) == 3
+    for suite, case in cases:
+        assert isinstance(suite, TestSuite)
+        assert isinstance(case, TestCase)
+        assert suite.name == "JUnitXmlReporter.constructor"
+        assert suite.tests == 3
+    assert [case.name for _, case in cases] == [
+        "should default path to an empty string",
+        "should default consolidate to true",
+        "should default useDotNotation to true",
+    ]
+    assert isinstance(cases[0][1].result[0], Failure)
+    assert isinstance(cases[1][1].result[0], Skipped)
+    assert cases[2][1].is_passed
+    assert len(list(cases[0][0].properties())) == 3
+
+
+def test_iterfile_file_obj():
+    with open(os.path.join(os.path.dirname(__file__), "data/normal.xml"), "rb") as f:
+        cases = list(JUnitXml.iterfile(f))
+    assert len(cases) == 3
+
+
+def test_iterfile_detaches_testcases():
+    path = os.path.join(os.path.dirname(__file__), "data/normal.xml")
+    suites = [suite for suite, _ in JUnitXml.iterfile(path)]
+    assert len(list(suites[0].iterchildren(TestCase))) == 0
+    assert len(list(suites[0].properties())) == 3
+
+
+def test_iterfile_with_testsuite_in_testsuite():
+    path = os.path.join(os.path.dirname(__file__), "data/jenkins.xml")
+    cases = list(JUnitXml.iterfile(path))
+    assert [suite.tests for suite, _ in cases] == [3, 2, 1]
+    assert isinstance(cases[0][1].result[0], Failure)
+    assert isinstance(cases[1][1].result[0], Skipped)
+    assert len(cases[2][1].result) == 0
+
+
+def test_iterfile_without_testsuites_tag():
+    path = os.path.join(os.path.dirname(__file__), "data/no_suites_tag.xml")
+    cases = list(JUnitXml.iterfile(path))
+    assert len(cases) == 3
+    assert all(suite.name == "JUnitXmlReporter.constructor" for suite, _ in cases)
+
+
+def test_iterfile_illegal_xml_file():
+    with pytest.raises(JUnitXmlError):
+        list(JUnitXml.iterfile(StringIO("<some></some>")))
+
+
+def test_itersuites():
+    path = os.path.join(os.path.dirname(__file__), "data/jenkins.xml")
+    suites = list(JUnitXml.itersuites(path))
+    assert [suite.name for suite in suites] == [
+        "JUnitXmlReporter",
+        "JUnitXmlReporter.constructor",
+    ]
+    assert len(suites[0]) == 0
+    assert len(suites[1]) == 3
+    assert len(list(suites[1].testsuites())) == 1
+
+
+def test_itersuites_without_testsuites_tag():
+    path = os.path.join(os.path.dirname(__file__), "data/no_suites_tag.xml")
+    suites = list(JUnitXml.itersuites(path))
+    assert len(suites) == 1
+    assert len(suites[0]) == 3
+
+
+@pytest.mark.parametrize(
+    "file", ["normal.xml", "jenkins.xml", "no_suites_tag.xml", "pytest_error.xml"]
+)
+def test_read_statistics(file):
+    path = os.path.join(os.path.dirname(__file__), "data", file)
+    xml = JUnitXml.fromfile(path)
+    xml.update_statistics()
+    assert read_statistics(path) == Statistics(
+        xml.tests, xml.failures, xml.errors, xml.skipped, xml.time
+    )
+
+
+def test_read_statistics_ignores_declared_attributes():
+    text = """<testsuites tests="100" failures="50">
+    <testsuite name="suite1" tests="10" time="100">
+    <testcase name="case1" time="1,000.5"><error message="error"/></testcase>
+    <testcase name="case2" time=""><failure/><skipped/></testcase>
+    </testsuite>
+    <testsuite name="suite2"><testcase name="case3" time="0.25"/></testsuite>
+    </testsuites>"""
+    assert read_statistics(StringIO(text)) == Statistics(3, 1, 1, 1, 1000.75)
+
+
+def test_read_statistics_illegal_xml_file():
+    with pytest.raises(JUnitXmlError):
+        read_statistics(StringIO("<some></some>"))
+
+
+@pytest.mark.parametrize(
+    "file", ["normal.xml", "jenkins.xml", "no_suites_tag.xml", "pytest_error.xml"]
+)
+def test_read_snapshot(file):
+    path = os.path.join(os.path.dirname(__file__), "data", file)
+    snapshot = read_snapshot(path)
+    assert snapshot == JUnitXml.fromfile(path).snapshot()
+    assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+
+
+def test_read_snapshot_nested_testsuites():
+    text = """<testsuites name="all" tests="3"><testsuite name="outer">
+    <testcase name="case1" time="1,000.5"><failure message="fail"/>
+    <system-out><failure message="not a result"/></system-out></testcase>
+    <testsuite name="inner"><testcase name="case2"><skipped/></testcase></testsuite>
+    <testcase name="case3"/>
+    </testsuite></testsuites>"""
+    snapshot = read_snapshot(StringIO(text))
+    assert snapshot == JUnitXml.fromstring(text).snapshot()
+    assert (snapshot.name, snapshot.tests) == ("all", 3)
+    outer, inner = snapshot.testsuites
+    assert [case.name for case in outer.testcases] == ["case1", "case3"]
+    assert (outer.testcases[0].time, outer.testcases[0].message) == (1000.5, "fail")
+    assert inner.testcases[0].status == "skipped"
+
+
+def test_read_snapshot_illegal_xml_file():
+    with pytest.raises(JUnitXmlError):
+        read_snapshot(StringIO("<some></some>"))
+
+
+def test_fromheader():
+    text = """<testsuites name="all" tests="5" failures="1" errors="0" skipped="2"
+    time="1.5"><testsuite name="suite1" tests="5"><testcase name="case1"/>
+    </testsuite><not-even-parsed"""
+    xml = JUnitXml.fromheader(StringIO(text))
+    assert xml.name == "all"
+    assert xml.tests == 5
+    assert xml.failures == 1
+    assert xml.errors == 0
+    assert xml.skipped == 2
+    assert xml.time == 1.5
+    assert len(xml) == 0
+
+
+def test_fromheader_sums_testsuites():
+    text = """<testsuites>
+    <testsuite name="suite1" tests="2" failures="1" errors="0" skipped="0" time="1">
+    <testcase name="case1"/></testsuite>
+    <testsuite name="suite2" tests="3" failures="0" errors="1" skipped="0" time="2.5"/>
+    </testsuites>"""
+    xml = JUnitXml.fromheader(StringIO(text))
+    assert [suite.name for suite in xml] == ["suite1", "suite2"]
+    assert all(len(suite) == 0 for suite in xml)
+    assert xml.tests == 5
+    assert xml.failures == 1
+    assert xml.errors == 1
+    assert xml.time == 3.5
+
+
+def test_fromheader_without_testsuites_tag():
+    path = os.path.join(os.path.dirname(__file__), "data/no_suites_tag.xml")
+    xml = JUnitXml.fromheader(path)
+    assert xml.filepath == path
+    suite = next(iter(xml))
+    assert suite.name == "JUnitXmlReporter.constructor"
+    assert suite.tests == 3
+    assert xml.tests == 3
+    assert xml.failures == 1
+    assert xml.skipped == 1
+
+
+def test_fromheader_missing_attributes():
+    text = """<testsuites>
+    <testsuite name="suite1" tests="10">
+    <testcase name="case1" time="0.5"><failure/></testcase>
+    <testcase name="case2" time="0.25"/></testsuite>
+    </testsuites>"""
+    xml = JUnitXml.fromheader(StringIO(text))
+    suite = next(iter(xml))
+    assert xml._elem.get("tests") == "10"
+    assert xml._elem.get("failures") is None
+    assert suite._elem.get("failures") is None
+
+    xml = JUnitXml.fromheader(StringIO(text), fallback=True)
+    suite = next(iter(xml))
+    assert suite.tests == 10
+    assert suite.failures == 1
+    assert suite.errors == 0
+    assert suite.time == 0.75
+    assert xml.tests == 10
+    assert xml.failures == 1
+    assert xml.time == 0.75
+
+
+@pytest.fixture(params=[gzip, bz2, lzma])
+def compressed_file(request, tmp_path):
+    path = tmp_path / "normal.xml.compressed"
+    with open(os.path.join(os.path.dirname(__file__), "data/normal.xml"), "rb") as f:
+        path.write_bytes(request.param.compress(f.read()))
+    return str(path)
+
+
+def test_fromfile_compressed(compressed_file):
+    do_test_fromfile(compressed_file)
+    assert JUnitXml.fromfile(compressed_file).filepath is None
+
+
+def test_fromfile_compressed_file_obj(compressed_file):
+    with open(compressed_file, "rb") as f:
+        do_test_fromfile(f)
+
+
+def test_iterfile_compressed(compressed_file):
+    assert len(list(JUnitXml.iterfile(compressed_file))) == 3
+
+
+def test_read_statistics_compressed(compressed_file):
+    assert read_statistics(compressed_file) == Statistics(3, 1, 0, 1, 0.006)
+
+
+def test_read_snapshot_compressed(compressed_file):
+    assert (
+        read_snapshot(compressed_file) == JUnitXml.fromfile(compressed_file).snapshot()
+    )
+
+
+def _data(file):
+    with open(os.path.join(os.path.dirname(__file__), "data", file), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(params=["zip", "tar.gz"])
+def archive(request, tmp_path):
+    members = {
+        "reports/TEST-jenkins.xml": _data("jenkins.xml"),
+        "reports/nested/TEST-pytest.xml.gz": gzip.compress(_data("pytest_error.xml")),
+        "README.txt": b"not a report",
+    }
+    path = tmp_path / f"artifacts.{request.param}"
+    if request.param == "zip":
+        with zipfile.ZipFile(path, "w") as zip_file:
+            for name, data in members.items():
+                zip_file.writestr(name, data)
+    else:
+        for name, data in members.items():
+            (tmp_path / "members" / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / "members" / name).write_bytes(data)
+        with tarfile.open(path, "w:gz") as tar_file:
+            tar_file.add(tmp_path / "members", arcname=".")
+    return str(path)
+
+
+def test_fromfile_archive_member(archive):
+    xml = JUnitXml.fromfile(archive + "!reports/TEST-jenkins.xml")
+    assert xml.tests == 3
+    assert xml.filepath is None
+
+
+def test_fromfile_archive_glob(archive):
+    xml = JUnitXml.fromfile(archive + "!**/TEST-*")
+    assert len(xml) == 3
+    assert xml.tests == 4
+    assert xml.failures == 2
+
+
+def test_fromfile_archive_no_match(archive):
+    with pytest.raises(FileNotFoundError):
+        JUnitXml.fromfile(archive + "!TEST-*.xml")
+
+
+def test_fromfile_not_an_archive():
+    path = os.path.join(os.path.dirname(__file__), "data/normal.xml")
+    with pytest.raises(JUnitXmlError):
+        JUnitXml.fromfile(path + "!TEST-*.xml")
+
+
+def test_iterfile_archive(archive):
+    assert len(list(JUnitXml.iterfile(archive + "!**/TEST-*"))) == 4
+
+
+def test_itersuites_archive(archive):
+    assert len(list(JUnitXml.itersuites(archive + "!**/TEST-*"))) == 3
+
+
+def test_read_statistics_archive(archive):
+    assert read_statistics(archive + "!**/TEST-*") == Statistics(4, 2, 0, 1, 0.007)
+
+
+def test_read_snapshot_archive(archive):
+    snapshot = read_snapshot(archive + "!**/TEST-*")
+    jenkins = read_snapshot(archive + "!reports/TEST-jenkins.xml")
+    pytest_error = read_snapshot(archive + "!reports/nested/TEST-pytest.xml.gz")
+    assert snapshot.testsuites == jenkins.testsuites + pytest_error.testsuites
+    assert sum(len(suite.testcases) for suite in snapshot.testsuites) == 4
+    assert snapshot.tests == (
+        None if jenkins.tests is None else jenkins.tests + pytest_error.tests
+    )
+
+
+def test_pull_parser():
+    parser = JUnitXmlPullParser()
+    data = _data("jenkins.xml")
+    events = []
+    statistics = []
+    for start in range(0, len(data), 100):
+        parser.feed(data[start : start + 100])
+        for event, obj in parser.read_events():
+            events.append((event, obj))
+            statistics.append(parser.statistics.tests)
+    parser.close()
+    events.extend(parser.read_events())
+    assert [event for event, _ in events] == [
+        "start",
+        "end",
+        "start",
+        "testcase",
+        "start",
+        "testcase",
+        "start",
+        "testcase",
+        "end",
+        "end",
+        "end",
+    ]
+    assert statistics == [0, 0, 0, 1, 1, 2, 2, 3, 3, 3, 3]
+    assert parser.statistics == Statistics(3, 1, 0, 1, 0.006)
+    suite, case = events[2][1], events[3][1]
+    assert isinstance(suite, TestSuite)
+    assert isinstance(case, TestCase)
+    assert isinstance(case.result[0], Failure)
+    assert len(list(suite)) == 0
+
+
+def test_pull_parser_str_chunks():
+    parser = JUnitXmlPullParser()
+    parser.feed('<testsuite name="suite"><testcase name="case1"/>')
+    assert [event for event, _ in parser.read_events()] == ["start", "testcase"]
+    parser.feed('<testcase name="case2"><skipped/></testcase></testsuite>')
+    parser.close()
+    events = list(parser.read_events())
+    assert [event for event, _ in events] == ["testcase", "end"]
+    assert events[1][1].name == "suite"
+    assert parser.statistics == Statistics(2, 0, 0, 1, 0)
+
+
+def test_sub_millisecond_times(tmp_path):
+    path = tmp_path / "fast.xml"
+    path.write_text(
+        '<testsuites><testsuite name="suite">'
+        + '<testcase name="case" time="0.0004"/>' * 10
+        + "</testsuite></testsuites>"
+    )
+    parser = JUnitXmlPullParser()
+    parser.feed(path.read_bytes())
+    list(parser.read_events())
+    xml = JUnitXml.fromfile(str(path))
+    xml.update_statistics()
+    assert parser.statistics.time == xml.time == 0.004
+    total = Statistics()
+    for _ in range(3):
+        total += read_statistics(str(path))
+    assert read_statistics(str(path)).time == 0.004
+    assert total.time == 0.012
+
+
+def test_pull_parser_illegal_xml():
+    parser = JUnitXmlPullParser()
+    parser.feed("<some></some>")
+    with pytest.raises(JUnitXmlError):
+        list(parser.read_events())
+
+
+def test_pull_parser_follow(tmp_path):
+    path = tmp_path / "growing.xml"
+    chunks = [
+        '<testsuites><testsuite name="suite">',
+        '<testcase name="case1"><failure/></testcase>',
+        '<testcase name="case2"/></testsuite>',
+        "</testsuites>",
+    ]
+
+    def write():
+        with open(path, "w") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                f.flush()
+                time.sleep(0.05)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    parser = JUnitXmlPullParser()
+    events = []
+    for event, obj in parser.follow(path, interval=0.01, timeout=5):
+        events.append((event, obj.name, parser.statistics.tests))
+    writer.join()
+    assert events == [
+        ("start", "suite", 0),
+        ("testcase", "case1", 1),
+        ("testcase", "case2", 2),
+        ("end", "suite", 2),
+    ]
+    assert parser.complete
+    assert parser.statistics == Statistics(2, 1, 0, 0, 0)
+
+
+def test_pull_parser_follow_timeout(tmp_path):
+    path = tmp_path / "unfinished.xml"
+    path.write_text('<testsuites><testsuite name="suite"><testcase name="case"/>')
+    parser = JUnitXmlPullParser()
+    events = list(parser.follow(path, interval=0.01, timeout=0.05))
+    assert [event for event, _ in events] == ["start", "testcase"]
+    assert not parser.complete
+
+
+def test_fromfile_case_filter():
+    path = os.path.join(os.path.dirname(__file__), "data/jenkins.xml")
+    xml = JUnitXml.fromfile(path, case_filter=lambda case: case.is_failure)
+    assert xml.filepath == path
+    assert [case.name for suite in xml for case in suite] == [
+        "should default path to an empty string"
+    ]
+    assert (xml.tests, xml.failures, xml.skipped, xml.time) == (3, 1, 1, 0.006)
+    empty, suite = xml
+    assert (empty.tests, suite.tests, suite.failures, suite.skipped) == (0, 3, 1, 1)
+    nested = suite.child(TestSuite)
+    assert (nested.tests, nested.skipped) == (2, 1)
+    assert len(list(nested)) == 0
+
+
+def test_fromfile_case_filter_sub_millisecond_times(tmp_path):
+    path = tmp_path / "fast.xml"
+    path.write_text(
+        '<testsuites><testsuite name="suite">'
+        + '<testcase name="case" time="0.0004"/>' * 10
+        + "</testsuite></testsuites>"
+    )
+    xml = JUnitXml.fromfile(str(path), case_filter=lambda case: False)
+    (suite,) = xml
+    assert suite._elem.get("time") == xml._elem.get("time") == "0.004"
+    assert (suite.time, xml.time) == (0.004, 0.004)
+
+
+def test_fromfile_case_filter_without_testsuites_tag():
+    path = os.path.join(os.path.dirname(__file__), "data/no_suites_tag.xml")
+    xml = JUnitXml.fromfile(path, case_filter=lambda case: case.is_passed)
+    (suite,) = xml
+    assert len(suite) == 1
+    assert (xml.tests, suite.tests, suite.failures) == (3, 3, 1)
+
+
+def test_fromfile_case_filter_compressed(compressed_file):
+    xml = JUnitXml.fromfile(compressed_file, case_filter=lambda case: False)
+    assert xml.filepath is None
+    assert len(list(xml.iterchildren(TestSuite))) == 2
+    assert xml.tests == 3
+
+
+def test_fromfile_case_filter_with_parse_func():
+    with pytest.raises(ValueError):
+        JUnitXml.fromfile("report.xml", lambda file: None, case_filter=bool)
+
+
+@pytest.fixture
+def large_output_file(tmp_path):
+    path = tmp_path / "output.xml"
+    path.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<testsuites><testsuite name="suite"><testcase name="case">'
+        '<failure message="failed">short</failure>'
+        "<system-out><![CDATA[<output>\n" + "x" * 1000 + "]]> &amp; é</system-out>"
+        "<system-err></system-err>"
+        "</testcase></testsuite></testsuites>",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_fromfile_lazy_text(large_output_file):
+    eager = JUnitXml.fromfile(large_output_file)
+    xml = JUnitXml.fromfile(large_output_file, lazy_text=True)
+    assert xml.filepath == large_output_file
+    ((case,),) = xml
+    ((eager_case,),) = eager
+    assert case.child(SystemOut)._elem.text is None
+    assert case.system_out == eager_case.system_out
+    assert case.system_out.startswith("<output>\nxxx")
+    assert case.system_out.endswith("x & é")
+    assert case.result[0].text == "short"
+    assert case.system_err is None
+
+
+def test_fromfile_lazy_text_set(large_output_file):
+    xml = JUnitXml.fromfile(large_output_file, lazy_text=True)
+    ((case,),) = xml
+    case.system_out = "replaced"
+    assert case.system_out == "replaced"
+    assert "lazy-text" not in repr(case.child(SystemOut))
+
+
+def test_fromfile_lazy_text_write(large_output_file, tmp_path):
+    xml = JUnitXml.fromfile(large_output_file, lazy_text=True)
+    xml.write(large_output_file)
+    ((case,),) = JUnitXml.fromfile(large_output_file)
+    assert case.system_out.endswith("x & é")
+    assert b"lazy-text" not in xml.tostring()
+
+
+def test_fromfile_lazy_text_without_testsuites_tag():
+    path = os.path.join(os.path.dirname(__file__), "data/no_suites_tag.xml")
+    eager = JUnitXml.fromfile(path)
+    xml = JUnitXml.fromfile(path, lazy_text=True)
+    assert [case.result for suite in xml for case in suite] == [
+        case.result for suite in eager for case in suite
+    ]
+
+
+def test_fromfile_lazy_text_requires_local_file(compressed_file):
+    with pytest.raises(ValueError):
+        JUnitXml.fromfile(compressed_file, lazy_text=True)
+    with open(compressed_file, "rb") as f, pytest.raises(ValueError):
+        JUnitXml.fromfile(f, lazy_text=True)
+
+
+@skipIf(not has_lxml, "lxml not installed")
+def test_get_parser_is_cached_per_thread():
+    parser = get_parser(huge_tree=True)
+    assert get_parser(huge_tree=True) is parser
+    assert get_parser() is not parser
+    other_threads = []
+    thread = threading.Thread(
+        target=lambda: other_threads.append(get_parser(huge_tree=True))
+    )
+    thread.start()
+    thread.join()
+    assert other_threads[0] is not parser
+
+
+@skipIf(not has_lxml, "lxml not installed")
+def test_get_parser_is_released_with_its_thread():
+    parsers = []
+    thread = threading.Thread(
+        target=lambda: parsers.append(weakref.ref(get_parser(huge_tree=True)))
+    )
+    thread.start()
+    thread.join()
+    gc.collect()
+    assert parsers[0]() is None
+
+
+@skipIf(not has_lxml, "lxml not installed")
+def test_fromfile_huge_tree(tmp_path):
+    path = tmp_path / "huge.xml"
+    path.write_text(
+        '<testsuite name="suite"><testcase name="case"><system-out>'
+        + "x" * 11_000_000
+        + "</system-out></testcase></testsuite>"
+    )
+    with pytest.raises(SyntaxError):
+        JUnitXml.fromfile(str(path))
+    xml = JUnitXml.fromfile(str(path), parser=get_parser(huge_tree=True))
+    ((case,),) = xml
+    assert len(case.system_out) == 11_000_000
+
+
+@pytest.fixture
+def huge_output_file(tmp_path):
+    path = tmp_path / "huge.xml"
+    path.write_text(
+        '<testsuites><testsuite name="suite"><testcase name="case"><system-out>'
+        + "x" * 12_000_000
+        + '</system-out></testcase><testcase name="other"/></testsuite>'
+        "</testsuites>"
+    )
+    return str(path)
+
+
+@skipIf(not has_lxml, "lxml not installed")
+def test_iterfile_huge_tree(huge_output_file):
+    with pytest.raises(SyntaxError):
+        list(JUnitXml.iterfile(huge_output_file))
+    parser = get_parser(huge_tree=True)
+    cases = [case for suite, case in JUnitXml.iterfile(huge_output_file, parser)]
+    assert [case.name for case in cases] == ["case", "other"]
+    assert len(cases[0].system_out) == 12_000_000
+
+
+@skipIf(not has_lxml, "lxml not installed")
+def test_itersuites_huge_tree(huge_output_file):
+    with pytest.raises(SyntaxError):
+        list(JUnitXml.itersuites(huge_output_file))
+    parser = get_parser(huge_tree=True)
+    (suite,) = JUnitXml.itersuites(huge_output_file, parser)
+    assert len(next(iter(suite)).system_out) == 12_000_000
+
+
+@skipIf(not has_lxml, "lxml not installed")
+def test_pull_parser_huge_tree(huge_output_file):
+    with open(huge_output_file, "rb") as f:
+        data = f.read()
+    with pytest.raises(SyntaxError):
+        parser = JUnitXmlPullParser()
+        parser.feed(data)
+        list(parser.read_events())
+    parser = JUnitXmlPullParser(parser=get_parser(huge_tree=True))
+    parser.feed(data)
+    parser.close()
+    cases = [obj for event, obj in parser.read_events() if event == "testcase"]
+    assert len(cases[0].system_out) == 12_000_000
+    assert parser.statistics.tests == 2
+
+
+@skipIf(not has_lxml, "lxml not installed")
+def test_fromfile_case_filter_huge_tree(huge_output_file):
+    with pytest.raises(SyntaxError):
+        JUnitXml.fromfile(huge_output_file, case_filter=bool)
+    xml = JUnitXml.fromfile(
+        huge_output_file,
+        case_filter=lambda case: case.name == "case",
+        parser=get_parser(huge_tree=True),
+    )
+    ((case,),) = xml
+    assert len(case.system_out) == 12_000_000
+    assert xml.tests == 2
+
+
+def test_fromfile_lazy_text_huge_tree(huge_output_file):
+    xml = JUnitXml.fromfile(
+        huge_output_file, lazy_text=True, parser=get_parser(huge_tree=True)
+    )
+    ((case, _),) = xml
+    assert len(case.system_out) == 12_000_000
+
+
+@skipIf(not has_lxml, "lxml not installed")
+def test_fromfile_lazy_text_parser_options():
+    path = os.path.join(os.path.dirname(__file__), "data/normal.xml")
+    for parser in get_parser(remove_blank_text=True), get_parser(resolve_entities=True):
+        with pytest.raises(ValueError):
+            JUnitXml.fromfile(path, lazy_text=True, parser=parser)
+    with pytest.raises(ValueError):
+        JUnitXml.fromfile(path, case_filter=bool, parser=XMLParser(huge_tree=True))
+    with pytest.raises(ValueError):
+        JUnitXml.fromfile(path, case_filter=bool, lazy_text=True)
+
+
+@skipIf(not has_lxml, "lxml not installed")
+def test_fromstring_remove_blank_text():
+    text = "<testsuites>\n  <testsuite name='suite'/>\n</testsuites>"
+    xml = JUnitXml.fromstring(text, parser=get_parser(remove_blank_text=True))
+    assert xml.tostring() == b'<testsuites><testsuite name="suite"/></testsuites>'
+
+
+@skipIf(has_lxml, "lxml installed")
+def test_get_parser_without_lxml():
+    assert get_parser(huge_tree=True) is not get_parser(huge_tree=True)
+    with pytest.raises(ValueError):
+        get_parser(remove_blank_text=True)
+
+
+def test_fromfile_parser():
+    path = os.path.join(os.path.dirname(__file__), "data/normal.xml")
+    do_test_fromfile(path)
+    xml = JUnitXml.fromfile(path, parser=get_parser())
+    assert xml.tests == 3
+    with pytest.raises(ValueError):
+        JUnitXml.fromfile(path, lambda file: None, parser=get_parser())
+
+
+@skipIf(not has_lxml, "lxml not installed")
+def test_fromstring_parser_without_entities():
+    text = """<!DOCTYPE testsuites [<!ENTITY name "expanded">]>
+    <testsuites><testsuite><testcase><system-out>&name;</system-out>
+    </testcase></testsuite></testsuites>"""
+    xml = JUnitXml.fromstring(text, parser=get_parser())
+    assert [case.system_out for suite in xml for case in suite] == [None]
+    xml = JUnitXml.fromstring(text, parser=get_parser(resolve_entities=True))
+    assert [case.system_out for suite in xml for case in suite] == ["expanded"]
@@ -1,10 +1,15 @@
+import gc
 import locale
+import mmap
 import os
+import pickle
+import weakref
 from copy import deepcopy
 from unittest import skipIf
 from xml.etree import ElementTree as etree
 import pytest
 
+from src.junitparser import junitparser
 from src.junitparser import (
     TestCase,
     TestSuite,
@@ -16,9 +21,13 @@ from src.junitparser import (
     JUnitXml,
     Property,
     Properties,
+    Status,
     IntAttr,
     FloatAttr,
     Element,
+    SystemOut,
+    CaseRecord,
+    SuiteRecord,
 )
 
 
@@ -219,6 +228,25 @@ class Test_JunitXml:
         text = cases[1].result[1].text
         assert "@pytest.fixture" in text
 
+    @pytest.mark.parametrize("buffer_type", [bytearray, memoryview])
+    def test_fromstring_buffer(self, buffer_type):
+        text = b"""<testsuites><testsuite name="suitename1">
+        <testcase name="testname1"><failure message="failed"/></testcase>
+        </testsuite></testsuites>"""
+        result = JUnitXml.fromstring(buffer_type(text))
+        assert isinstance(result, JUnitXml)
+        assert len(result) == 1
+        assert result.failures == 1
+
+    def test_fromstring_mmap(self, tmp_path):
+        path = tmp_path / "junit.xml"
+        cases = "".join(f'<testcase name="case{i}"/>' for i in range(10000))
+        path.write_text(f"<testsuite name='suitename1'>{cases}</testsuite>")
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                result = JUnitXml.fromstring(mm)
+        assert result.tests == 10000
+
     def test_fromstring_invalid(self):
         text = """<random name="suitename1"></random>"""
         with pytest.raises(Exception) as context:
@@ -350,6 +378,99 @@ class Test_JunitXml:
         result3.update_statistics()
         assert result3.tests == 0
 
+    def test_to_columns(self):
+        xml = JUnitXml.fromstring(
+            "<testsuites><testsuite name='outer'>"
+            "<testcase name='a' classname='cls' time='1,000.5'>"
+            "<skipped message='skip'/><failure message='fail'/></testcase>"
+            "<testsuite name='inner'><testcase name='b'/>"
+            "<testcase name='c' time='2'><error message='err'/><failure/></testcase>"
+            "</testsuite></testsuite></testsuites>"
+        )
+        columns = xml.to_columns()
+        assert len(columns) == 3
+        assert columns.suite == ["outer", "inner", "inner"]
+        assert columns.classname == ["cls", None, None]
+        assert columns.name == ["a", "b", "c"]
+        assert columns.time[0] == 1000.5 and columns.time[2] == 2.0
+        assert columns.time[1] != columns.time[1]
+        assert [columns.STATUSES[code] for code in columns.status] == [
+            case.status for suite in xml for case in suite
+        ]
+        assert [columns.message(i) for i in range(3)] == ["fail", "", "err"]
+
+    def test_to_columns_empty_time(self):
+        xml = JUnitXml.fromstring(
+            "<testsuites><testsuite name='suite'><testcase name='a' time=''/>"
+            "</testsuite></testsuites>"
+        )
+        columns = xml.to_columns()
+        assert list(list(xml)[0])[0].time is None
+        assert columns.time[0] != columns.time[0]
+
+    def test_snapshot(self):
+        xml = JUnitXml.fromstring(
+            "<testsuites name='all' tests='3'><testsuite name='outer' tests='3'>"
+            "<testcase name='a' classname='cls' time='1,000.5'>"
+            "<skipped message='skip'/><failure message='fail'/></testcase>"
+            "<testsuite name='inner' hostname='host'><testcase name='b'/>"
+            "<testcase name='c' classname='cls'><error message='err'/></testcase>"
+            "</testsuite></testsuite></testsuites>"
+        )
+        snapshot = xml.snapshot()
+        assert (snapshot.name, snapshot.tests, snapshot.failures) == ("all", 3, None)
+        outer, inner = snapshot.testsuites
+        assert (outer.name, outer.tests, len(outer.testcases)) == ("outer", 3, 1)
+        assert (inner.name, inner.hostname, inner.tests) == ("inner", "host", None)
+        assert outer.testcases[0] == CaseRecord(
+            "a", "cls", 1000.5, Status.FAILURE, "fail"
+        )
+        assert inner.testcases[1].classname is outer.testcases[0].classname
+        for record, case in zip(outer.testcases + inner.testcases, xml.select()):
+            for field in ("name", "classname", "time", "status"):
+                assert getattr(record, field) == getattr(case, field)
+        assert all(hasattr(TestCase(), field) for field in CaseRecord._fields[:-1])
+        assert all(hasattr(TestSuite(), field) for field in SuiteRecord._fields[:-1])
+        assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+
+    def test_to_columns_numpy(self):
+        numpy = pytest.importorskip("numpy")
+        columns = JUnitXml.fromfile(
+            os.path.join(os.path.dirname(__file__), "data/jenkins.xml")
+        ).to_columns()
+        arrays = columns.to_numpy()
+        assert list(arrays["status"]) == list(columns.status)
+        assert numpy.shares_memory(arrays["time"], numpy.frombuffer(columns.time))
+        assert arrays["name"][0] == columns.name[0]
+
+    def test_junitxml_remove_testcases(self):
+        xml = JUnitXml.from_records(
+            [
+                {"name": "a", "testsuite": "one", "status": "failure"},
+                {"name": "b", "testsuite": "one"},
+                {"name": "c", "testsuite": "two", "status": "failure"},
+            ]
+        )
+        assert xml.remove_testcases(lambda case: case.is_failure) == 2
+        assert [[case.name for case in suite] for suite in xml] == [["b"], []]
+        assert (xml.tests, xml.failures) == (1, 0)
+        assert [suite.tests for suite in xml] == [1, 0]
+
+    def test_junitxml_from_records(self):
+        xml = JUnitXml.from_records(
+            [
+                {"name": "a", "testsuite": "one", "status": "failure"},
+                {"name": "b", "testsuite": "two"},
+                ("c", None, 2, None, None, None, None, "one"),
+            ],
+            name="report",
+        )
+        assert xml.name == "report"
+        assert [suite.name for suite in xml] == ["one", "two"]
+        assert [[case.name for case in suite] for suite in xml] == [["a", "c"], ["b"]]
+        assert (xml.tests, xml.failures, xml.time) == (3, 1, 2.0)
+        assert [suite.tests for suite in xml] == [2, 1]
+
 
 class Test_TestSuite:
     def test_fromstring(self):
@@ -516,6 +637,60 @@ class Test_TestSuite:
         assert suite.errors == 1
         assert suite.skipped == 1
 
+    def test_from_records(self):
+        suite = TestSuite.from_records(
+            [
+                ("a", "cls", 0.5),
+                {"name": "b", "status": "failure", "message": "msg", "text": "text"},
+                ("c", "cls", 1, Status.ERROR, None, None, "out"),
+                ("d", None, None, Status.SKIPPED),
+                {"name": "e", "status": Status.PASSED, "stdout": "out"},
+            ],
+            name="suite",
+        )
+        assert suite.name == "suite"
+        assert (suite.tests, suite.failures, suite.errors) == (5, 1, 1)
+        assert (suite.skipped, suite.time) == (1, 1.5)
+        a, b, c, d, e = suite
+        assert (a.name, a.classname, a.time, a.status) == ("a", "cls", 0.5, "passed")
+        assert b.status == Status.FAILURE
+        assert (b.result[0].message, b.result[0].text) == ("msg", "text")
+        assert (c.status, c.system_out, c.result[0].message) == ("error", "out", None)
+        assert d.is_skipped and d.classname is None and d.time is None
+        assert e.is_passed and e.system_out == "out"
+        expected = suite.tostring()
+        suite.update_statistics()
+        assert suite.tostring() == expected
+
+    def test_remove_testcases(self):
+        suite = TestSuite.fromstring(
+            "<testsuite name='outer'><properties/>"
+            "<testcase name='a'><skipped/></testcase><testcase name='b' time='1'/>"
+            "<testsuite name='inner'><testcase name='c'><skipped/></testcase>"
+            "<testcase name='d'/></testsuite><system-out>out</system-out>"
+            "</testsuite>"
+        )
+        assert suite.find(None, "c") is not None
+        seen = []
+
+        def skipped(case):
+            seen.append(case.name)
+            return case.is_skipped
+
+        assert suite.remove_testcases(skipped) == 2
+        assert seen == ["a", "b", "c", "d"]
+        assert [case.name for case in suite] == ["b", "d"]
+        assert (suite.tests, suite.skipped, suite.time) == (2, 0, 1.0)
+        assert suite.find(None, "c") is None
+        assert suite.child(SystemOut).text == "out"
+        assert suite.remove_testcases(lambda case: False) == 0
+
+    def test_from_records_invalid(self):
+        with pytest.raises(ValueError):
+            TestSuite.from_records([("a", "cls", 1, "flaky")])
+        with pytest.raises(ValueError):
+            TestSuite.from_records([("a",) * 9])
+
 
 class Test_TestCase:
     def test_case_fromstring(self):
@@ -727,6 +902,97 @@ class Test_TestCase:
         assert not case.is_failure
         assert case.is_error
 
+    def test_case_status(self):
+        case = TestCase()
+        assert case.status == Status.PASSED
+        case.result = [Skipped()]
+        assert case.status == Status.SKIPPED
+        case.append(Failure())
+        assert case.status == Status.FAILURE
+        case.extend([Error()])
+        assert case.status == Status.ERROR
+        assert case.is_failure and case.is_error and case.is_skipped
+        case.remove(Error())
+        assert case.status == Status.FAILURE
+        case.result = []
+        assert case.status == Status.PASSED
+        assert case.status == "passed"
+
+    def test_case_status_from_direct_children(self):
+        case = TestCase.fromstring(
+            """<testcase name="case">
+            <system-out><failure>not a result</failure></system-out>
+            <skipped/>
+            </testcase>"""
+        )
+        assert case.status == Status.SKIPPED
+        assert not case.is_failure
+
+    def test_case_key(self):
+        case = TestCase("name", "classname")
+        assert case.key == ("classname", "name", None)
+        case.name = "other"
+        assert case.key == ("classname", "other", None)
+        case = TestCase.fromstring('<testcase name="n" classname="c" file="f.py"/>')
+        assert case.key == ("c", "n", "f.py")
+
+    def test_case_attrs_overriding_set(self):
+        class UpperAttr(Attr):
+            def __set__(self, instance, value):
+                instance._elem.set(self.name, value.upper())
+
+        class SecondsAttr(FloatAttr):
+            def __set__(self, instance, value):
+                instance._elem.set(self.name, str(value / 1000))
+
+        class MyTestCase(TestCase):
+            name = UpperAttr()
+            time = SecondsAttr()
+
+        suite = TestSuite("suite")
+        case = MyTestCase("case", "cls")
+        suite.add_testcase(case)
+        assert case.key == ("cls", "CASE", None)
+        assert suite.find("cls", "CASE") is not None
+        case.name = "other"
+        assert case.key == ("cls", "OTHER", None)
+        assert suite.find("cls", "OTHER") is not None
+        case.time = 1500
+        assert suite.time == 1.5
+
+    def test_case_eq_compares_content(self):
+        text = """<testcase name="case" classname="cls" time="0.1">
+            <failure message="failed">trace</failure>
+            <system-out>output</system-out>
+        </testcase>"""
+        case1 = TestCase.fromstring(text)
+        case2 = TestCase.fromstring(text.replace("output", "other output"))
+        case3 = TestCase.fromstring(text.replace("0.1", "0.2"))
+        assert case1 == TestCase.fromstring(text)
+        assert case1 != case2
+        assert case1 != case3
+        assert case1.key == case2.key == case3.key
+        assert hash(case1) == hash(case2)
+        assert len({case1, case2, TestCase.fromstring(text)}) == 2
+
+    def test_case_eq_ignores_tail(self):
+        suite = TestSuite.fromstring(
+            "<testsuite><testcase name='case'/>\n  <testcase name='case'/></testsuite>"
+        )
+        case1, case2 = suite
+        assert case1 == case2
+        assert case1 != TestCase("other")
+        assert case1 != "case"
+
+    def test_case_status_is_cached(self):
+        case = TestCase.fromstring("<testcase name='case'/>")
+        assert case.status == Status.PASSED
+        # Changes bypassing the API are not seen.
+        case._elem.append(Failure()._elem)
+        assert case.status == Status.PASSED
+        case.result = [Failure()]
+        assert case.status == Status.FAILURE
+
 
 class Test_Properties:
     def test_property_repr1(self):
@@ -786,6 +1052,380 @@ class Test_Properties:
         assert props1 != props2
 
 
+class Test_TestcaseIndex:
+    def make_xml(self):
+        return JUnitXml.fromstring(
+            "<testsuites><testsuite name='one'>"
+            "<testcase classname='a' name='t1'/><testcase classname='a' name='t2'/>"
+            "<testsuite name='nested'><testcase classname='b' name='t3'/></testsuite>"
+            "</testsuite><testsuite name='two'>"
+            "<testcase classname='a' name='t1' file='two.py'><failure/></testcase>"
+            "</testsuite></testsuites>"
+        )
+
+    def test_find(self):
+        xml = self.make_xml()
+        one, two = xml
+        assert one.find("a", "t2").name == "t2"
+        assert one.find("b", "t3").name == "t3"
+        assert one.find("a", "t3") is None
+        assert xml.find("a", "t1") is list(one)[0]
+        assert xml.find("a", "t1", file="two.py").is_failure
+        assert two.find("a", "t1", file="one.py") is None
+
+    def test_contains(self):
+        xml = self.make_xml()
+        one, two = xml
+        assert ("a", "t1") in one
+        assert ("b", "t3") in xml
+        assert ("b", "t3") not in two
+        assert TestCase("t1", "a") in one
+        assert TestCase("t1", "a") not in two
+        assert list(two)[0] in xml
+        assert two in xml
+        assert "t1" not in one
+
+    def test_index_follows_changes(self):
+        xml = self.make_xml()
+        one, two = xml
+        assert xml.find("c", "new") is None
+        one.add_testcase(TestCase("new", "c"))
+        two.add_testcases([TestCase("new2", "c")])
+        assert xml.find("c", "new").name == "new"
+        assert ("c", "new2") in xml and ("c", "new2") in two
+        one.remove_testcase(TestCase("t1", "a"))
+        assert one.find("a", "t1") is None
+        assert xml.find("a", "t1") is list(two)[0]
+        assert len(one) == 3 and one.tests == 3
+
+        case = xml.find("c", "new")
+        case.name = "renamed"
+        assert xml.find("c", "new") is None
+        assert one.find("c", "renamed") is case
+
+        one._elem.append(TestCase("raw", "c")._elem)
+        assert one.find("c", "raw") is not None
+
+    def test_found_case_updates_statistics(self):
+        xml = self.make_xml()
+        xml.update_statistics()
+        xml.find("b", "t3").result = [Error()]
+        assert (xml.tests, xml.errors) == (4, 1)
+
+    def test_index_follows_merged_testsuites(self):
+        xml = self.make_xml()
+        assert xml.find("c", "y") is None
+        suite = TestSuite("two")
+        suite.add_testcase(TestCase("y", "c"))
+        xml.add_testsuite(suite)
+        assert xml.find("c", "y").name == "y"
+        assert ("c", "y") in xml
+
+    def test_index_follows_appended_testcases(self):
+        xml = self.make_xml()
+        one, two = xml
+        nested = list(one.testsuites())[0]
+        assert xml.find("c", "z") is None
+        two.append(TestCase("z", "c"))
+        nested.append(TestCase("n", "c"))
+        assert ("c", "z") in two
+        assert xml.find("c", "z").name == "z"
+        assert xml.find("c", "n") is one.find("c", "n")
+
+
+class Test_Select:
+    def make_xml(self):
+        return JUnitXml.fromstring(
+            "<testsuites><testsuite name='one'>"
+            "<testcase classname='pkg.a' name='t1' time='6'><failure/></testcase>"
+            "<testcase classname='pkg.b' name='t2' time='1,006.5'>"
+            "<failure/><error/></testcase>"
+            "<testsuite name='nested'>"
+            "<testcase classname='pkg.c' name='t3' time='7'><failure/></testcase>"
+            "</testsuite>"
+            "<testcase classname='other' name='t4' time='9'><failure/></testcase>"
+            "</testsuite><testsuite name='two'>"
+            "<testcase classname='pkg.d' name='t5'><skipped/></testcase>"
+            "<testcase name='t6' time='0.5'/>"
+            "</testsuite></testsuites>"
+        )
+
+    def names(self, cases):
+        return [case.name for case in cases]
+
+    def test_select(self):
+        xml = self.make_xml()
+        one, two = xml
+        selected = xml.select(status="failure", classname_glob="pkg.*", min_time=5.0)
+        assert self.names(selected) == ["t1", "t3"]
+        assert self.names(xml.select()) == ["t1", "t2", "t3", "t4", "t5", "t6"]
+        assert self.names(one.select(status=Status.ERROR)) == ["t2"]
+        assert self.names(xml.select(status="skipped")) == ["t5"]
+        assert self.names(xml.select(status="passed")) == ["t6"]
+        assert self.names(xml.select(classname="pkg.c")) == ["t3"]
+        assert self.names(two.select(classname_glob="*")) == ["t5"]
+        assert self.names(xml.select(classname_glob="pkg.c")) == ["t3"]
+        assert self.names(xml.select(classname_glob="*.[ab]")) == ["t1", "t2"]
+        assert self.names(xml.select(name_glob="t[13]", max_time=6.5)) == ["t1"]
+        assert self.names(xml.select(min_time=1000)) == ["t2"]
+        assert self.names(xml.select(max_time=1)) == ["t6"]
+        assert xml.select(name="t1", classname="other") == []
+        assert xml.select(name="t1")[0] is list(one)[0]
+
+    def test_select_invalid_status(self):
+        with pytest.raises(ValueError):
+            self.make_xml().select(status="broken")
+
+    def test_selected_case_updates_statistics(self):
+        xml = self.make_xml()
+        xml.update_statistics()
+        (case,) = xml.select(name="t3")
+        case.result = []
+        one = list(xml)[0]
+        assert (xml.failures, one.failures) == (3, 3)
+
+    @pytest.mark.skipif(not has_lxml, reason="lxml package has to be installed")
+    def test_queries_are_cached(self):
+        xml = self.make_xml()
+        xml.select(status="failure", min_time=5.0)
+        queries = dict(junitparser._queries.cache)
+        assert self.names(xml.select(status="failure", min_time=8.0)) == ["t4"]
+        assert junitparser._queries.cache == queries
+
+
+class Test_IdentityMap:
+    def test_iterating_twice_yields_the_same_objects(self):
+        xml = JUnitXml.fromstring(
+            "<testsuites><testsuite><testcase name='case'><failure/></testcase>"
+            "</testsuite></testsuites>"
+        )
+        suites = list(xml)
+        cases = [case for suite in xml for case in suite]
+        assert list(xml)[0] is suites[0]
+        assert [case for suite in xml for case in suite][0] is cases[0]
+        assert cases[0].result[0] is cases[0].result[0]
+
+    def test_appended_object_is_yielded(self):
+        suite = TestSuite("suite")
+        case = TestCase("case")
+        suite.add_testcase(case)
+        assert list(suite)[0] is case
+        suite.add_testcases([TestCase("case2")])
+        assert list(suite)[1] is list(suite)[1]
+
+    def test_objects_by_class(self):
+        class MyTestCase(TestCase):
+            pass
+
+        case = TestCase.fromstring("<testcase name='case'/>")
+        assert TestCase.fromelem(case) is case
+        assert TestCase.fromelem(case._elem) is TestCase.fromelem(case._elem)
+        my_case = MyTestCase.fromelem(case)
+        assert isinstance(my_case, MyTestCase)
+        assert my_case is not TestCase.fromelem(case)
+        assert my_case._elem is case._elem
+
+    def test_unused_objects_are_released(self):
+        suite = TestSuite.fromstring("<testsuite><testcase name='case'/></testsuite>")
+        case = list(suite)[0]
+        ref = weakref.ref(case)
+        del case
+        gc.collect()
+        assert ref() is None
+        assert list(suite)[0] is list(suite)[0]
+
+    def test_entries_go_away_with_their_objects(self):
+        suite = TestSuite.fromstring(
+            "<testsuite><testcase name='a'/><testcase name='b'/></testsuite>"
+        )
+        case = list(suite)[0]
+        by_elem = junitparser._document(suite)[TestCase]
+        gc.collect()
+        assert list(by_elem) == [case._elem]
+        suite.remove_testcase(case)
+        del case
+        gc.collect()
+        assert len(by_elem) == 0
+
+    def test_identity_map_per_document(self):
+        suite = TestSuite.fromstring("<testsuite><testcase name='case'/></testsuite>")
+        wrappers = weakref.ref(junitparser._document(suite))
+        case = list(suite)[0]
+        assert case._wrappers is suite._wrappers
+        del suite, case
+        gc.collect()
+        assert wrappers() is None
+
+
+class Test_Slots:
+    def test_no_instance_dict(self):
+        for obj in (TestCase("case"), Failure(), TestSuite("suite"), JUnitXml()):
+            assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            TestCase("case").undeclared = 1
+
+    def test_subclass_with_instance_attributes(self):
+        class MyTestCase(TestCase):
+            foo = Attr()
+
+            def __init__(self, name=None):
+                super().__init__(name)
+                self.note = "note"
+
+        case = MyTestCase("case")
+        case.foo = "bar"
+        assert case.note == "note"
+        assert dict(case._elem.attrib) == {"name": "case", "foo": "bar"}
+
+    def test_deepcopy(self):
+        suite = TestSuite("suite")
+        suite.filepath = "suite.xml"
+        copy = deepcopy(suite)
+        assert copy.filepath == "suite.xml"
+        assert copy.name == "suite"
+        assert copy._elem is not suite._elem
+
+    def test_deepcopy_is_detached(self):
+        xml = JUnitXml()
+        xml.add_testsuite(TestSuite("suite"))
+        xml.update_statistics()
+        copy = deepcopy(list(xml)[0])
+        copy.add_testcase(TestCase("case"))
+        assert copy.tests == 1
+        assert xml.tests == 0
+
+    @pytest.mark.skipif(has_lxml, reason="lxml elements can't be pickled")
+    def test_pickle(self):
+        xml = JUnitXml.fromstring(
+            "<testsuites><testsuite name='suite'><testcase name='case'/>"
+            "</testsuite></testsuites>"
+        )
+        xml.update_statistics()
+        suite = list(xml)[0]
+        case = list(suite)[0]
+        suite, case = pickle.loads(pickle.dumps((suite, case)))
+        assert (suite.name, suite.tests, case.name) == ("suite", 1, "case")
+        case.result = [Failure()]
+        suite.update_statistics()
+        assert suite.failures == 1
+
+
+class Test_IncrementalStatistics:
+    def make_xml(self):
+        return JUnitXml.fromstring(
+            "<testsuites><testsuite name='outer'>"
+            "<testcase name='a' time='1.5'/>"
+            "<testsuite name='inner'><testcase name='b'><failure/></testcase>"
+            "</testsuite></testsuite></testsuites>"
+        )
+
+    def test_changes_propagate_to_parents(self):
+        xml = self.make_xml()
+        xml.update_statistics()
+        outer = list(xml)[0]
+        inner = list(outer.testsuites())[0]
+        assert (xml.tests, xml.failures, xml.time) == (2, 1, 1.5)
+
+        inner.add_testcase(TestCase("c", time=0.25))
+        assert (inner.tests, outer.tests, xml.tests) == (2, 3, 3)
+        assert xml.time == 1.75
+
+        inner.add_testcases([TestCase("d"), TestCase("e")])
+        assert (inner.tests, outer.tests, xml.tests) == (4, 5, 5)
+
+        case = [case for case in inner if case.name == "b"][0]
+        case.result = [Error()]
+        assert (outer.failures, outer.errors) == (0, 1)
+        assert (xml.failures, xml.errors) == (0, 1)
+
+        case.append(Skipped())
+        assert xml.skipped == 1
+        inner.remove_testcase(case)
+        assert (inner.tests, outer.tests, xml.tests) == (3, 4, 4)
+        assert (xml.errors, xml.skipped) == (0, 0)
+
+    def test_no_recount_when_unchanged(self, monkeypatch):
+        xml = self.make_xml()
+        xml.update_statistics()
+        counted = []
+        original = junitparser._case_statistics
+
+        def count(elem):
+            counted.append(elem.get("name"))
+            return original(elem)
+
+        monkeypatch.setattr(junitparser, "_case_statistics", count)
+        xml._update_statistics()
+        assert counted == []
+        list(xml)[0].add_testcase(TestCase("c"))
+        xml._update_statistics()
+        assert counted == ["c"]
+        assert xml.tests == 3
+        # An explicit update recounts everything.
+        xml.update_statistics()
+        assert sorted(counted) == ["a", "b", "c", "c"]
+
+    def test_recount_after_outside_changes(self):
+        xml = self.make_xml()
+        xml.update_statistics()
+        outer = list(xml)[0]
+        outer._elem.append(TestCase("c")._elem)
+        xml.update_statistics()
+        assert (outer.tests, xml.tests) == (3, 3)
+
+        case = list(outer)[0]
+        case.time = 2.5
+        xml.update_statistics()
+        assert (outer.time, xml.time) == (2.5, 2.5)
+
+    def test_recount_after_outside_changes_below_testcases(self):
+        xml = self.make_xml()
+        xml.update_statistics()
+        case = list(list(xml)[0])[0]
+        case._elem.append(Error()._elem)
+        xml.update_statistics()
+        assert xml.errors == 1
+        case._elem.set("time", "3")
+        xml.update_statistics()
+        assert xml.time == 3
+
+    def test_recount_after_outside_removal(self):
+        xml = JUnitXml.fromstring(
+            "<testsuites><testsuite name='suite'>"
+            "<testcase name='a'><failure/></testcase><testcase name='b'/>"
+            "</testsuite></testsuites>"
+        )
+        xml.update_statistics()
+        suite = list(xml)[0]
+        suite._elem.remove(suite._elem[0])
+        suite.update_statistics()
+        assert (suite.tests, suite.failures) == (1, 0)
+
+    def test_changes_after_testsuites_are_gone(self):
+        xml = JUnitXml.fromstring(
+            "<testsuites><testsuite name='suite'>"
+            "<testcase name='a' time='1'/><testcase name='b' time='2'/>"
+            "</testsuite></testsuites>"
+        )
+        cases = [case for suite in xml for case in suite]
+        gc.collect()
+        xml.update_statistics()
+        cases[0].result = [Failure()]
+        xml.update_statistics()
+        assert xml.failures == 1
+        cases[1].time = 10.0
+        xml.update_statistics()
+        assert xml.time == 11.0
+
+    def test_changes_of_cases_from_elements(self):
+        xml = self.make_xml()
+        xml.update_statistics()
+        case = TestCase.fromelem(xml._elem.find("testsuite/testcase"))
+        case.result = [Failure()]
+        xml.update_statistics()
+        assert xml.failures == 2
+
+
 class Test_Attrs:
     def test_attr(self):
         TestCase.text = Attr("text")
@@ -1,4 +1,5 @@
 import textwrap
+from io import StringIO
 from src.junitparser.xunit2 import (
     JUnitXml,
     TestSuite,
@@ -8,7 +9,7 @@ from src.junitparser.xunit2 import (
     FlakyFailure,
     FlakyError,
 )
-from src.junitparser import Failure, Property
+from src.junitparser import Failure, JUnitXmlPullParser, Property, Status
 from copy import deepcopy
 
 
@@ -303,3 +304,57 @@ class Test_JUnitXml:
         assert isinstance(cases[0], TestCase)
         assert isinstance(cases[1], TestCase)
         assert [test.name for test in suite] == ["test name 1", "test name 2"]
+
+    def test_iterfile(self):
+        text = """<testsuites><testsuite name="suitename1" file="a.py">
+        <testcase name="testname1" group="g1">
+        <flakyFailure message="flaky" /></testcase>
+        <testcase name="testname2"/></testsuite></testsuites>"""
+        cases = list(JUnitXml.iterfile(StringIO(text)))
+        assert len(cases) == 2
+        suite, case = cases[0]
+        assert isinstance(suite, TestSuite)
+        assert isinstance(case, TestCase)
+        assert suite.file == "a.py"
+        assert case.group == "g1"
+        assert case.is_flaky
+        assert [case.name for _, case in cases] == ["testname1", "testname2"]
+
+    def test_status_ignores_interim_results(self):
+        case = TestCase("case")
+        case.add_interim_result(RerunFailure("Not found", "404"))
+        assert case.status == Status.PASSED
+        case.result = [Failure()]
+        assert case.status == Status.FAILURE
+        assert case.is_rerun
+
+    def test_pull_parser(self):
+        parser = JUnitXmlPullParser(JUnitXml)
+        parser.feed('<testsuite name="suite"><testcase name="case" group="g1">')
+        parser.feed("<rerunFailure/></testcase></testsuite>")
+        parser.close()
+        events = list(parser.read_events())
+        assert isinstance(events[0][1], TestSuite)
+        assert isinstance(events[1][1], TestCase)
+        assert events[1][1].group == "g1"
+        assert events[1][1].is_rerun
+        assert parser.statistics.tests == 1
+
+    def test_fromheader(self):
+        text = """<testsuites tests="2" failures="1" errors="0" time="0.5">
+        <testsuite name="suite1"/><not-even-parsed"""
+        xml = JUnitXml.fromheader(StringIO(text))
+        assert xml.tests == 2
+        assert xml.failures == 1
+        assert xml.skipped is None
+        assert len(xml) == 0
+
+    def test_find_by_group(self):
+        suite = TestSuite("suite")
+        for group in ("g1", "g2"):
+            case = TestCase("case", "cls")
+            case.group = group
+            suite.add_testcase(case)
+        assert suite.find("cls", "case", group="g2").group == "g2"
+        assert isinstance(suite.find("cls", "case"), TestCase)
+        assert suite.find("cls", "case", group="g3") is None